@@ -1,19 +1,15 @@
 """
 Script de demonstração interativa dos Autômatos Celulares Elementares
 
-Execute este script para uma demonstração completa do projeto.
+Execute este script a partir da raiz do projeto para uma demonstração
+completa: python demo.py
 """
 
-import sys
-import os
-
-# Adicionar src ao path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-from automato_elementar import AutomatoElementar
-from visualizador import Visualizador
-from classificador import ClassificadorWolfram
-from utils import *
+from src.automato_elementar import AutomatoElementar
+from src.visualizador import Visualizador, exibir_figuras, MODO_HEADLESS
+from src.classificador import ClassificadorWolfram
+from src.cache import automato_evoluido
+from src.utils import *
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -47,7 +43,7 @@ def demonstracao_basica():
     print("\nVisualizando evolução...")
     viz = Visualizador(automato)
     fig = viz.mostrar_evolucao()
-    plt.show()
+    exibir_figuras('demo_basica')
     
     return automato
 
@@ -64,9 +60,10 @@ def demonstracao_classificacao():
     nomes_exemplo = ["Homogêneo", "Periódico", "Caótico", "Complexo"]
     
     print("Classificando regras exemplo...")
+    resultados = classificador.classificar_multiplas_regras(regras_exemplo)
     
     for regra, nome in zip(regras_exemplo, nomes_exemplo):
-        resultado = classificador.classificar_regra(regra)
+        resultado = resultados[regra]
         print(f"\nRegra {regra} ({nome}):")
         print(f"  Classe: {resultado['nome_classe']}")
         print(f"  Descrição: {resultado['descricao']}")
@@ -89,7 +86,7 @@ def demonstracao_comparativa():
     print("Comparando regras lado a lado...")
     fig = viz.comparar_regras(regras, geracoes=60)
     plt.suptitle('Comparação de Regras Famosas', fontsize=16)
-    plt.show()
+    exibir_figuras('demo_comparativa')
     
     return regras
 
@@ -113,9 +110,7 @@ def demonstracao_estados_iniciais():
     for i, (nome, estado_inicial) in enumerate(estados.items()):
         print(f"Testando estado inicial: {nome}")
         
-        automato = AutomatoElementar(regra, tamanho)
-        automato.resetar(estado_inicial)
-        automato.evoluir(80)
+        automato = automato_evoluido(regra, tamanho, 80, estado_inicial)
         
         matriz = automato.obter_matriz_evolucao()
         axes[i].imshow(matriz, cmap='viridis', aspect='auto')
@@ -124,7 +119,7 @@ def demonstracao_estados_iniciais():
     
     plt.suptitle(f'Regra {regra} com Diferentes Estados Iniciais', fontsize=14)
     plt.tight_layout()
-    plt.show()
+    exibir_figuras('demo_estados_iniciais')
 
 
 def demonstracao_interativa():
@@ -136,7 +131,8 @@ def demonstracao_interativa():
     print("Sugestões: 30 (caótico), 90 (fractal), 110 (complexo), 150 (periódico)")
     
     try:
-        regra = int(input("Digite o número da regra: "))
+        # Sem interface (HEADLESS=1) a demonstração roda sem interação
+        regra = 30 if MODO_HEADLESS else int(input("Digite o número da regra: "))
         if not 0 <= regra <= 255:
             print("Regra deve estar entre 0 e 255. Usando regra 30.")
             regra = 30
@@ -146,18 +142,17 @@ def demonstracao_interativa():
     
     print(f"\nExplorando Regra {regra}...")
     
-    # Criar e evoluir autômato
-    automato = AutomatoElementar(regra, 101)
-    automato.evoluir(100)
+    # Obter autômato evoluído (reaproveitado se a regra já foi simulada)
+    automato = automato_evoluido(regra, 101, 100)
     
     # Visualizar evolução
     viz = Visualizador(automato)
     fig = viz.mostrar_evolucao()
-    plt.show()
+    exibir_figuras('demo_interativa_evolucao')
     
     # Mostrar tabela da regra
     fig_regra = viz.mostrar_regra_binaria()
-    plt.show()
+    exibir_figuras('demo_interativa_regra')
     
     # Classificar
     classificador = ClassificadorWolfram()
@@ -194,8 +189,8 @@ def main():
         print("\n🎉 DEMONSTRAÇÃO CONCLUÍDA!")
         print("=" * 26)
         print("\nPara explorar mais:")
-        print("- Execute 'python exemplos/regras_famosas.py' para ver exemplos específicos")
-        print("- Execute 'python exemplos/experimentos.py' para análises avançadas")
+        print("- Execute 'python -m exemplos.regras_famosas' para ver exemplos específicos")
+        print("- Execute 'python -m exemplos.experimentos' para análises avançadas")
         print("- Execute 'python testes/test_automato.py' para validar o código")
         print("\nDocumentação completa no README.md")
         
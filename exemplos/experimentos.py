@@ -3,18 +3,14 @@ Experimentos e Análises Avançadas com Autômatos Celulares Elementares
 
 Este script demonstra experimentos mais avançados, incluindo análise
 estatística, detecção de padrões e estudos comparativos.
-"""
-
-import sys
-import os
 
-# Adicionar src ao path para imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+Execute a partir da raiz do projeto: python -m exemplos.experimentos
+"""
 
-from automato_elementar import AutomatoElementar
-from visualizador import Visualizador
-from classificador import ClassificadorWolfram
-from utils import *
+from src.visualizador import Visualizador, exibir_figuras
+from src.classificador import ClassificadorWolfram
+from src.cache import automato_evoluido
+from src.utils import *
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -42,10 +38,8 @@ def experimento_estados_iniciais():
     fig, axes = plt.subplots(1, len(estados), figsize=(20, 6))
     
     for i, (nome, estado_inicial) in enumerate(estados.items()):
-        # Criar e evoluir autômato
-        automato = AutomatoElementar(regra, tamanho)
-        automato.resetar(estado_inicial)
-        automato.evoluir(geracoes)
+        # Obter autômato evoluído a partir do estado inicial
+        automato = automato_evoluido(regra, tamanho, geracoes, estado_inicial)
         
         # Plotar
         matriz = automato.obter_matriz_evolucao()
@@ -58,7 +52,7 @@ def experimento_estados_iniciais():
     
     plt.suptitle(f'Regra {regra} com Diferentes Estados Iniciais', fontsize=16, fontweight='bold')
     plt.tight_layout()
-    plt.show()
+    exibir_figuras('experimento_estados_iniciais')
     
     print("Observação: Mesmo regras caóticas podem mostrar sensibilidade")
     print("ao estado inicial, mas tendem a convergir para comportamentos similares.\n")
@@ -79,14 +73,13 @@ def experimento_convergencia():
     axes = axes.flatten()
     
     for i, regra in enumerate(regras_teste):
-        automato = AutomatoElementar(regra, tamanho)
-        automato.evoluir(geracoes)
+        automato = automato_evoluido(regra, tamanho, geracoes)
         
         # Analisar convergência
         convergencia = analisar_convergencia(automato)
         
         # Plotar densidade ao longo do tempo
-        densidades = [np.mean(estado) for estado in automato.historico]
+        densidades = automato.obter_densidades()
         axes[i].plot(densidades, linewidth=2)
         axes[i].set_title(f'Regra {regra}\nConvergiu: {convergencia["convergiu"]}')
         axes[i].set_xlabel('Geração')
@@ -106,7 +99,7 @@ def experimento_convergencia():
     
     plt.suptitle('Análise de Convergência por Regra', fontsize=16, fontweight='bold')
     plt.tight_layout()
-    plt.show()
+    exibir_figuras('experimento_convergencia')
     print()
 
 
@@ -122,9 +115,8 @@ def experimento_deteccao_padroes():
     for regra in regras_teste:
         print(f"\nRegra {regra}:")
         
-        # Criar e evoluir autômato
-        automato = AutomatoElementar(regra, 101)
-        automato.evoluir(100)
+        # Obter autômato evoluído (compartilhado com os demais experimentos)
+        automato = automato_evoluido(regra, 101, 100)
         
         # Detectar padrões
         matriz = automato.obter_matriz_evolucao()
@@ -155,8 +147,7 @@ def experimento_dimensao_fractal():
     
     print("Estimativas de dimensão fractal:")
     for regra in regras_fractais:
-        automato = AutomatoElementar(regra, 101)
-        automato.evoluir(100)
+        automato = automato_evoluido(regra, 101, 100)
         
         matriz = automato.obter_matriz_evolucao()
         dim_fractal = calcular_dimensao_fractal(matriz)
@@ -178,10 +169,11 @@ def experimento_benchmark_performance():
     regras_teste = [8, 30, 90, 110, 150, 184]
     
     print("Executando benchmark...")
-    resultados = benchmark_regras(regras_teste, tamanho=201, geracoes=200)
+    resultados = benchmark_regras(regras_teste, tamanho=201, geracoes=200, paralelo=True)
     
     print("\nResultados:")
     print(f"Tempo total: {resultados['tempo_total']:.3f} segundos")
+    print(f"Tempo decorrido: {resultados['tempo_decorrido']:.3f} segundos")
     
     regra_rapida, dados_rapida = resultados['regra_mais_rapida']
     regra_lenta, dados_lenta = resultados['regra_mais_lenta']
@@ -233,7 +225,7 @@ def experimento_classificacao_massiva():
                 f'{count}', ha='center', va='bottom')
     
     plt.tight_layout()
-    plt.show()
+    exibir_figuras('experimento_classificacao_massiva')
     
     print("\nExemplos de regras por classe:")
     for classe in [1, 2, 3, 4]:
@@ -254,8 +246,7 @@ def experimento_simetrias():
     for regra in regras_teste:
         print(f"\nRegra {regra}:")
         
-        automato = AutomatoElementar(regra, 101)
-        automato.evoluir(50)
+        automato = automato_evoluido(regra, 101, 50)
         
         # Analisar simetrias no estado final
         simetrias = detectar_simetria(automato.estado_atual)
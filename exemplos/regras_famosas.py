@@ -3,18 +3,17 @@ Exemplos de Regras Famosas de Autômatos Celulares Elementares
 
 Este script demonstra o uso de algumas das regras mais conhecidas e
 interessantes dos autômatos celulares elementares de Wolfram.
-"""
-
-import sys
-import os
 
-# Adicionar src ao path para imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+Execute a partir da raiz do projeto: python -m exemplos.regras_famosas
+"""
 
-from automato_elementar import AutomatoElementar
-from visualizador import Visualizador
-from classificador import ClassificadorWolfram
+from src.automato_elementar import AutomatoElementar
+from src.visualizador import Visualizador, exibir_figuras
+from src.classificador import ClassificadorWolfram
+from src.cache import automato_evoluido
+from src.utils import gerar_estado_aleatorio
 import matplotlib.pyplot as plt
+import numpy as np
 
 
 def exemplo_regra_30():
@@ -26,15 +25,14 @@ def exemplo_regra_30():
     """
     print("=== REGRA 30 - COMPORTAMENTO CAÓTICO ===")
     
-    # Criar autômato
-    automato = AutomatoElementar(regra=30, tamanho=101)
-    automato.evoluir(geracoes=100)
+    # Obter autômato evoluído
+    automato = automato_evoluido(regra=30, tamanho=101, geracoes=100)
     
     # Visualizar
     viz = Visualizador(automato)
     fig = viz.mostrar_evolucao()
     plt.title("Regra 30 - Padrão Caótico")
-    plt.show()
+    exibir_figuras('regra_30')
     
     # Mostrar estatísticas
     stats = automato.obter_estatisticas()
@@ -57,20 +55,19 @@ def exemplo_regra_90():
     """
     print("=== REGRA 90 - TRIÂNGULO DE SIERPINSKI ===")
     
-    # Criar autômato
-    automato = AutomatoElementar(regra=90, tamanho=101)
-    automato.evoluir(geracoes=80)
+    # Obter autômato evoluído
+    automato = automato_evoluido(regra=90, tamanho=101, geracoes=80)
     
     # Visualizar
     viz = Visualizador(automato)
     viz.definir_esquema_cor('azul')
     fig = viz.mostrar_evolucao()
     plt.title("Regra 90 - Triângulo de Sierpinski")
-    plt.show()
+    exibir_figuras('regra_90_evolucao')
     
     # Mostrar tabela da regra
     fig_regra = viz.mostrar_regra_binaria()
-    plt.show()
+    exibir_figuras('regra_90_tabela')
     
     # Estatísticas
     stats = automato.obter_estatisticas()
@@ -93,27 +90,24 @@ def exemplo_regra_110():
     """
     print("=== REGRA 110 - COMPUTAÇÃO UNIVERSAL ===")
     
-    # Criar autômato com estado inicial mais interessante
-    automato = AutomatoElementar(regra=110, tamanho=101)
-    
     # Estado inicial: algumas células ativas espalhadas
-    import numpy as np
-    estado_inicial = np.zeros(101)
+    estado_inicial = np.zeros(101, dtype=np.uint8)
     estado_inicial[45:55] = [1, 1, 0, 1, 0, 1, 1, 0, 1, 0]
-    automato.resetar(estado_inicial)
     
-    automato.evoluir(geracoes=200)
+    # Obter autômato evoluído a partir do estado inicial
+    automato = automato_evoluido(regra=110, tamanho=101, geracoes=200,
+                                 estado_inicial=estado_inicial)
     
     # Visualizar
     viz = Visualizador(automato)
     viz.definir_esquema_cor('verde')
     fig = viz.mostrar_evolucao()
     plt.title("Regra 110 - Estruturas Complexas")
-    plt.show()
+    exibir_figuras('regra_110_evolucao')
     
     # Análise de densidade
     fig_densidade = viz.plotar_densidade_temporal()
-    plt.show()
+    exibir_figuras('regra_110_densidade')
     
     # Estatísticas
     stats = automato.obter_estatisticas()
@@ -135,16 +129,15 @@ def exemplo_regra_150():
     """
     print("=== REGRA 150 - PADRÕES FRACTAIS ===")
     
-    # Criar autômato
-    automato = AutomatoElementar(regra=150, tamanho=101)
-    automato.evoluir(geracoes=80)
+    # Obter autômato evoluído
+    automato = automato_evoluido(regra=150, tamanho=101, geracoes=80)
     
     # Visualizar
     viz = Visualizador(automato)
     viz.definir_esquema_cor('roxo')
     fig = viz.mostrar_evolucao()
     plt.title("Regra 150 - Padrões Fractais")
-    plt.show()
+    exibir_figuras('regra_150')
     
     # Estatísticas
     stats = automato.obter_estatisticas()
@@ -162,27 +155,24 @@ def exemplo_regra_184():
     """
     print("=== REGRA 184 - MODELO DE TRÁFEGO ===")
     
-    # Criar autômato com densidade média de "carros"
-    automato = AutomatoElementar(regra=184, tamanho=101)
-    
     # Estado inicial: distribuição aleatória de carros
-    from src.utils import gerar_estado_aleatorio
     estado_inicial = gerar_estado_aleatorio(101, densidade=0.3, semente=42)
-    automato.resetar(estado_inicial)
     
-    automato.evoluir(geracoes=100)
+    # Obter autômato evoluído com densidade média de "carros"
+    automato = automato_evoluido(regra=184, tamanho=101, geracoes=100,
+                                 estado_inicial=estado_inicial)
     
     # Visualizar
     viz = Visualizador(automato)
     viz.definir_esquema_cor('vermelho')
     fig = viz.mostrar_evolucao()
     plt.title("Regra 184 - Fluxo de Tráfego")
-    plt.show()
+    exibir_figuras('regra_184_evolucao')
     
     # Criar animação
     print("Criando animação...")
     anim = viz.criar_animacao(intervalo=150)
-    plt.show()
+    exibir_figuras('regra_184_animacao')
     
     # Estatísticas
     stats = automato.obter_estatisticas()
@@ -220,14 +210,15 @@ def comparacao_regras_por_classe():
     
     plt.suptitle('Comparação das Classes de Wolfram', fontsize=16, fontweight='bold')
     plt.tight_layout()
-    plt.show()
+    exibir_figuras('comparacao_classes')
     
     # Análise estatística
     classificador = ClassificadorWolfram()
     
     print("Análise detalhada por classe:")
+    resultados = classificador.classificar_multiplas_regras(list(regras_exemplo.values()))
     for classe, regra in regras_exemplo.items():
-        resultado = classificador.classificar_regra(regra)
+        resultado = resultados[regra]
         print(f"\n{classe}:")
         print(f"  Regra: {regra}")
         print(f"  Classificação: {resultado['nome_classe']}")
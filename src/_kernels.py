@@ -0,0 +1,417 @@
+"""
+Núcleos compilados com Numba para a evolução dos autômatos celulares.
+
+Numba é uma dependência opcional. Quando não está instalado,
+NUMBA_DISPONIVEL é False e o AutomatoElementar usa apenas os motores
+implementados com NumPy.
+"""
+
+import numpy as np
+
+try:
+    from numba import get_num_threads, njit, prange
+    NUMBA_DISPONIVEL = True
+except ImportError:
+    NUMBA_DISPONIVEL = False
+
+
+if NUMBA_DISPONIVEL:
+
+    # Compilado na primeira chamada. Sem cache em disco: o cache do Numba
+    # guarda o nome do módulo e falha quando este arquivo é importado tanto
+    # como `_kernels` (testes) quanto como `src._kernels` (scripts).
+    # Os passos de uma geração são inline='always': chamados uma vez por
+    # geração nos laços de evolução, o custo da chamada dominaria em estados
+    # pequenos
+    @njit(boundscheck=False, inline='always')
+    def passo_regra(estado, saida, regra, circular):
+        """
+        Calcula uma geração aplicando a regra diretamente como inteiro.
+
+        O bit de saída é (regra >> vizinhança) & 1, sem consulta a tabela.
+        As bordas são tratadas fora do laço, de modo que o laço interno não
+        tem desvios nem módulo e o LLVM o vetoriza.
+
+        Args:
+            estado: Estado atual (np.uint8, contíguo)
+            saida: Array onde o novo estado é escrito (pode ser uma linha do histórico)
+            regra: Número da regra (0-255)
+            circular: Se True, usa contorno circular; senão, vizinhos externos são 0
+        """
+        n = estado.shape[0]
+        if n == 0:
+            return
+        if n == 1:
+            centro = estado[0]
+            if circular:
+                saida[0] = (regra >> ((centro << 2) | (centro << 1) | centro)) & 1
+            else:
+                saida[0] = (regra >> (centro << 1)) & 1
+            return
+
+        # Bordas
+        if circular:
+            esquerda_borda = estado[n - 1]
+            direita_borda = estado[0]
+        else:
+            esquerda_borda = 0
+            direita_borda = 0
+        saida[0] = (regra >> ((esquerda_borda << 2) | (estado[0] << 1) | estado[1])) & 1
+        saida[n - 1] = (regra >> ((estado[n - 2] << 2) | (estado[n - 1] << 1) | direita_borda)) & 1
+
+        # Interior, todo em uint8: com constantes inteiras os deslocamentos
+        # seriam promovidos a int64 e cada vetor do LLVM levaria 8x menos células
+        regra8 = np.uint8(regra)
+        um = np.uint8(1)
+        dois = np.uint8(2)
+        for i in range(1, n - 1):
+            saida[i] = (regra8 >> ((estado[i - 1] << dois) | (estado[i] << um) | estado[i + 1])) & um
+
+    @njit(boundscheck=False)
+    def evoluir_regra(bloco, regra, circular):
+        """
+        Preenche as linhas 1.. do bloco a partir da linha 0, sem voltar ao Python.
+
+        Args:
+            bloco: Matriz (gerações+1, tamanho) np.uint8 com linhas contíguas
+            regra: Número da regra (0-255)
+            circular: Se True, usa contorno circular; senão, vizinhos externos são 0
+        """
+        for t in range(bloco.shape[0] - 1):
+            passo_regra(bloco[t], bloco[t + 1], regra, circular)
+
+    @njit(boundscheck=False)
+    def passo_interior(estado, saida, regra):
+        """
+        Calcula saida[1:n-1], as células com os dois vizinhos dentro de estado.
+
+        Não é inline: chamada sobre um trecho de cada vez dentro de uma região
+        paralela, continua um laço simples sobre arrays contíguos, que o LLVM
+        vetoriza (inserido na região paralela, o laço deixa de ser vetorizado).
+
+        Args:
+            estado: Trecho do estado atual, com uma célula de margem de cada lado
+            saida: Trecho correspondente do novo estado
+            regra: Número da regra (0-255)
+        """
+        regra8 = np.uint8(regra)
+        um = np.uint8(1)
+        dois = np.uint8(2)
+        for i in range(1, estado.shape[0] - 1):
+            saida[i] = (regra8 >> ((estado[i - 1] << dois) | (estado[i] << um) | estado[i + 1])) & um
+
+    @njit(boundscheck=False, parallel=True)
+    def evoluir_regra_paralelo(bloco, regra, circular):
+        """
+        Evolui como evoluir_regra, dividindo as células de cada geração entre
+        as threads do Numba.
+
+        Cada thread calcula um trecho contíguo do interior a partir do trecho
+        correspondente da geração anterior com uma célula de margem de cada
+        lado, de modo que os trechos são independentes; as bordas são
+        calculadas antes. Cada geração é uma região paralela, então só
+        compensa em estados grandes (ver LIMIAR_MOTOR_PARALELO em
+        automato_elementar).
+
+        Args:
+            bloco: Matriz (gerações+1, tamanho) np.uint8 com linhas contíguas
+            regra: Número da regra (0-255)
+            circular: Se True, usa contorno circular; senão, vizinhos externos são 0
+        """
+        n = bloco.shape[1]
+        if n < 3:
+            evoluir_regra(bloco, regra, circular)
+            return
+
+        trechos = get_num_threads()
+        por_trecho = (n - 2 + trechos - 1) // trechos
+        for t in range(bloco.shape[0] - 1):
+            estado = bloco[t]
+            saida = bloco[t + 1]
+
+            # Bordas
+            if circular:
+                esquerda_borda = estado[n - 1]
+                direita_borda = estado[0]
+            else:
+                esquerda_borda = 0
+                direita_borda = 0
+            saida[0] = (regra >> ((esquerda_borda << 2) | (estado[0] << 1) | estado[1])) & 1
+            saida[n - 1] = (regra >> ((estado[n - 2] << 2) | (estado[n - 1] << 1) | direita_borda)) & 1
+
+            # Interior: o trecho [inicio, fim + 2) produz as células inicio+1..fim
+            for trecho in prange(trechos):
+                inicio = trecho * por_trecho
+                fim = min(inicio + por_trecho, n - 2)
+                if inicio < fim:
+                    passo_interior(estado[inicio:fim + 2], saida[inicio:fim + 2], regra)
+
+    @njit(boundscheck=False, inline='always')
+    def passo_regra_contando(estado, saida, regra, circular):
+        """
+        Calcula uma geração como passo_regra e conta, na mesma passada, as
+        células vivas da nova geração e as células que mudaram de estado.
+
+        Args:
+            estado: Estado atual (np.uint8, contíguo)
+            saida: Array onde o novo estado é escrito (pode ser uma linha do histórico)
+            regra: Número da regra (0-255)
+            circular: Se True, usa contorno circular; senão, vizinhos externos são 0
+
+        Returns:
+            Tupla (células vivas, células que mudaram)
+        """
+        n = estado.shape[0]
+        if n < 2:
+            passo_regra(estado, saida, regra, circular)
+            vivas = 0
+            mudancas = 0
+            for i in range(n):
+                vivas += saida[i]
+                mudancas += saida[i] ^ estado[i]
+            return vivas, mudancas
+
+        # Bordas
+        if circular:
+            esquerda_borda = estado[n - 1]
+            direita_borda = estado[0]
+        else:
+            esquerda_borda = 0
+            direita_borda = 0
+        primeira = (regra >> ((esquerda_borda << 2) | (estado[0] << 1) | estado[1])) & 1
+        ultima = (regra >> ((estado[n - 2] << 2) | (estado[n - 1] << 1) | direita_borda)) & 1
+        saida[0] = primeira
+        saida[n - 1] = ultima
+        vivas = primeira + ultima
+        mudancas = (primeira ^ estado[0]) + (ultima ^ estado[n - 1])
+
+        # Interior em uint8 (como em passo_regra), acumulando as contagens
+        # sem nova leitura do histórico
+        regra8 = np.uint8(regra)
+        um = np.uint8(1)
+        dois = np.uint8(2)
+        for i in range(1, n - 1):
+            novo = (regra8 >> ((estado[i - 1] << dois) | (estado[i] << um) | estado[i + 1])) & um
+            saida[i] = novo
+            vivas += novo
+            mudancas += novo ^ estado[i]
+
+        return vivas, mudancas
+
+    @njit(boundscheck=False)
+    def evoluir_lote_contando(historicos, regras, circular, vivas, mudancas):
+        """
+        Evolui várias regras e conta células vivas e mudanças de cada geração.
+
+        Args:
+            historicos: Tensor (regras, gerações+1, tamanho) np.uint8 com a linha 0 preenchida
+            regras: Array com o número de cada regra
+            circular: Se True, usa contorno circular; senão, vizinhos externos são 0
+            vivas: Array (regras, gerações+1) preenchido com as células vivas
+            mudancas: Array (regras, gerações) preenchido com as células que mudaram
+        """
+        for r in range(historicos.shape[0]):
+            regra = regras[r]
+            bloco = historicos[r]
+
+            total = 0
+            for i in range(bloco.shape[1]):
+                total += bloco[0, i]
+            vivas[r, 0] = total
+
+            for t in range(bloco.shape[0] - 1):
+                vivas[r, t + 1], mudancas[r, t] = passo_regra_contando(
+                    bloco[t], bloco[t + 1], regra, circular)
+
+    @njit(boundscheck=False)
+    def contar_janelas(matriz, tamanho_janela, contagens, primeiros):
+        """
+        Conta as janelas binárias de cada linha com um código deslizante.
+
+        O código da janela é atualizado a cada célula (desloca, insere a nova
+        célula e descarta a mais antiga), sem reler as células da janela.
+
+        Args:
+            matriz: Matriz (gerações, células) np.uint8 binária
+            tamanho_janela: Número de células por janela
+            contagens: Array (2**tamanho_janela,) zerado, preenchido com as contagens
+            primeiros: Array (2**tamanho_janela,) com -1, preenchido com a posição
+                (na ordem de varredura) da primeira ocorrência de cada código
+        """
+        n_janelas = matriz.shape[1] - tamanho_janela + 1
+        mascara = (1 << tamanho_janela) - 1
+        posicao = 0
+        for t in range(matriz.shape[0]):
+            codigo = 0
+            for j in range(tamanho_janela - 1):
+                codigo = (codigo << 1) | matriz[t, j]
+            for i in range(n_janelas):
+                codigo = ((codigo << 1) | matriz[t, i + tamanho_janela - 1]) & mascara
+                if contagens[codigo] == 0:
+                    primeiros[codigo] = posicao
+                contagens[codigo] += 1
+                posicao += 1
+
+    @njit(boundscheck=False)
+    def contar_vivas(matriz, saida):
+        """
+        Conta as células vivas de cada linha de uma matriz binária.
+
+        A soma de cada linha é acumulada em um único inteiro de 32 bits,
+        percorrendo a matriz uma vez na ordem em que está na memória.
+
+        Args:
+            matriz: Matriz (gerações, células) np.uint8 binária
+            saida: Array (gerações,) np.uint32 preenchido com as contagens
+        """
+        for t in range(matriz.shape[0]):
+            total = np.uint32(0)
+            for i in range(matriz.shape[1]):
+                total += matriz[t, i]
+            saida[t] = total
+
+    @njit(boundscheck=False)
+    def distancia_hamming(estado1, estado2):
+        """
+        Conta as posições em que dois estados diferem, em uma única passada.
+
+        Args:
+            estado1: Primeiro estado (np.uint8, contíguo)
+            estado2: Segundo estado (np.uint8, contíguo, mesmo tamanho)
+
+        Returns:
+            Número de posições diferentes
+        """
+        diferentes = 0
+        for i in range(estado1.shape[0]):
+            diferentes += estado1[i] != estado2[i]
+        return diferentes
+
+    @njit(boundscheck=False, inline='always')
+    def mascaras_regra(regra):
+        """
+        Converte a regra nas máscaras usadas por aplicar_regra_palavras.
+
+        Para cada par (esquerda, centro) a regra escolhe a saída em função da
+        direita: a saída com direita 0 (base) e a diferença para direita 1,
+        cada uma como palavra toda 0 ou toda 1.
+
+        Args:
+            regra: Número da regra (0-255)
+
+        Returns:
+            Tupla (base, diferença) dos pares 00, 01, 10 e 11 de (esquerda, centro)
+        """
+        zero = np.uint64(0)
+        m0 = zero - np.uint64(regra & 1)
+        m1 = zero - np.uint64((regra >> 1) & 1)
+        m2 = zero - np.uint64((regra >> 2) & 1)
+        m3 = zero - np.uint64((regra >> 3) & 1)
+        m4 = zero - np.uint64((regra >> 4) & 1)
+        m5 = zero - np.uint64((regra >> 5) & 1)
+        m6 = zero - np.uint64((regra >> 6) & 1)
+        m7 = zero - np.uint64((regra >> 7) & 1)
+        return (m0, m0 ^ m1, m2, m2 ^ m3, m4, m4 ^ m5, m6, m6 ^ m7)
+
+    @njit(boundscheck=False, inline='always')
+    def aplicar_regra_palavras(esquerda, centro, direita, mascaras):
+        """
+        Aplica a regra a 64 células por palavra com multiplexadores sem desvios.
+
+        A tabela da regra é percorrida como árvore de decisão: a direita
+        escolhe entre as duas saídas de cada par (esquerda, centro), depois o
+        centro e por fim a esquerda. São 17 operações para qualquer regra,
+        todas sobre palavras inteiras, de modo que o laço das palavras é
+        vetorizado.
+
+        Args:
+            esquerda: Palavra com o vizinho esquerdo de cada célula
+            centro: Palavra com as células
+            direita: Palavra com o vizinho direito de cada célula
+            mascaras: Máscaras da regra (ver mascaras_regra)
+
+        Returns:
+            Palavra com o novo estado das células
+        """
+        base00, dif00, base01, dif01, base10, dif10, base11, dif11 = mascaras
+        g00 = base00 ^ (direita & dif00)
+        g01 = base01 ^ (direita & dif01)
+        g10 = base10 ^ (direita & dif10)
+        g11 = base11 ^ (direita & dif11)
+        h0 = g00 ^ (centro & (g00 ^ g01))
+        h1 = g10 ^ (centro & (g10 ^ g11))
+        return h0 ^ (esquerda & (h0 ^ h1))
+
+    @njit(boundscheck=False, inline='always')
+    def passo_empacotado(palavras, saida, regra, tamanho, circular):
+        """
+        Calcula uma geração sobre o estado empacotado (64 células por palavra).
+
+        A célula i ocupa o bit (i % 64) da palavra (i // 64). Os vizinhos de
+        cada palavra são obtidos por deslocamento com o transporte das palavras
+        vizinhas, e a regra é aplicada por aplicar_regra_palavras. A primeira
+        e a última palavra são tratadas fora do laço, que fica sem desvios.
+
+        Args:
+            palavras: Estado atual empacotado (np.uint64)
+            saida: Array onde o novo estado empacotado é escrito
+            regra: Número da regra (0-255)
+            tamanho: Número de células do estado
+            circular: Se True, usa contorno circular; senão, vizinhos externos são 0
+        """
+        n = palavras.shape[0]
+        if n == 0:
+            return
+        um = np.uint64(1)
+        transporte = np.uint64(63)
+        ultimo_bit = np.uint64((tamanho - 1) % 64)
+        mascaras = mascaras_regra(regra)
+
+        # Bits que entram pelas bordas do estado
+        if circular:
+            entrada_esquerda = (palavras[n - 1] >> ultimo_bit) & um
+            entrada_direita = (palavras[0] & um) << ultimo_bit
+        else:
+            entrada_esquerda = np.uint64(0)
+            entrada_direita = np.uint64(0)
+
+        # Primeira palavra (também a última, se for a única)
+        centro = palavras[0]
+        esquerda = (centro << um) | entrada_esquerda
+        if n > 1:
+            direita = (centro >> um) | (palavras[1] << transporte)
+        else:
+            direita = (centro >> um) | entrada_direita
+        saida[0] = aplicar_regra_palavras(esquerda, centro, direita, mascaras)
+
+        # Palavras internas: o vizinho esquerdo da célula i é a célula i-1
+        # (bit deslocado para cima) e o direito é a célula i+1
+        for k in range(1, n - 1):
+            centro = palavras[k]
+            esquerda = (centro << um) | (palavras[k - 1] >> transporte)
+            direita = (centro >> um) | (palavras[k + 1] << transporte)
+            saida[k] = aplicar_regra_palavras(esquerda, centro, direita, mascaras)
+
+        # Última palavra
+        if n > 1:
+            centro = palavras[n - 1]
+            esquerda = (centro << um) | (palavras[n - 2] >> transporte)
+            direita = (centro >> um) | entrada_direita
+            saida[n - 1] = aplicar_regra_palavras(esquerda, centro, direita, mascaras)
+
+        # Zerar os bits além da última célula
+        saida[n - 1] &= ~np.uint64(0) >> (transporte - ultimo_bit)
+
+    @njit(boundscheck=False)
+    def evoluir_empacotado(bloco, regra, tamanho, circular):
+        """
+        Preenche as linhas 1.. do bloco empacotado a partir da linha 0.
+
+        Args:
+            bloco: Matriz (gerações+1, palavras) np.uint64 com a linha 0 preenchida
+            regra: Número da regra (0-255)
+            tamanho: Número de células do estado
+            circular: Se True, usa contorno circular; senão, vizinhos externos são 0
+        """
+        for t in range(bloco.shape[0] - 1):
+            passo_empacotado(bloco[t], bloco[t + 1], regra, tamanho, circular)
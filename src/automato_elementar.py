@@ -6,8 +6,256 @@ elementares de Wolfram (regras 0-255).
 """
 
 import numpy as np
-from typing import List, Tuple, Optional
-import copy
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple, Optional
+
+try:
+    from . import _kernels
+except ImportError:
+    import _kernels
+
+
+# Células por palavra no estado empacotado (uma célula por bit)
+BITS_POR_PALAVRA = 64
+
+# Motores de evolução disponíveis ('auto' prefere numba, se instalado)
+MOTORES = ('auto', 'tabela', 'bits', 'numba')
+
+# Sem numba, a partir deste tamanho o motor 'auto' usa o estado empacotado
+LIMIAR_MOTOR_BITS = 1024
+
+# A partir deste tamanho o motor 'numba' divide as células de cada geração
+# entre as threads do Numba (se houver mais de uma)
+LIMIAR_MOTOR_PARALELO = 1 << 18
+
+# Gerações calculadas por vez antes de empacotar o histórico compacto
+GERACOES_POR_BLOCO_COMPACTO = 256
+
+# Gerações da primeira etapa de evoluir; as etapas dobram de tamanho até que
+# um ciclo seja detectado, e daí em diante o histórico apenas repete o ciclo
+GERACOES_PRIMEIRA_ETAPA = 16
+
+# Número de bits 1 em cada byte (para NumPy sem np.bitwise_count)
+_BITS_POR_BYTE = np.array([bin(b).count('1') for b in range(256)], dtype=np.uint8)
+
+# Passos especializados já gerados, por regra (ver _passo_regra)
+_PASSOS_POR_REGRA: Dict[int, Callable] = {}
+
+
+def _contar_bits(linhas: np.ndarray) -> np.ndarray:
+    """
+    Conta os bits 1 de cada linha de uma matriz de bytes empacotados.
+    
+    Args:
+        linhas: Matriz (linhas, bytes) np.uint8
+        
+    Returns:
+        Array com a contagem de bits de cada linha
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(linhas).sum(axis=-1, dtype=np.int64)
+    return _BITS_POR_BYTE[linhas].sum(axis=-1, dtype=np.int64)
+
+
+def _estender(estados: np.ndarray, circular: bool,
+              saida: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Copia o(s) estado(s) com uma célula extra em cada borda.
+    
+    As células extras recebem os vizinhos externos (as células do lado oposto
+    no contorno circular, 0 no fixo), de modo que as vizinhanças de todas as
+    células são três fatias sem desvios nem módulo.
+    
+    Args:
+        estados: Estado(s) atual(is), células no último eixo
+        circular: Se True, usa contorno circular; senão, vizinhos externos são 0
+        saida: Array (..., tamanho+2) reaproveitado entre gerações, se fornecido
+        
+    Returns:
+        Array (..., tamanho+2) com o(s) estado(s) estendido(s)
+    """
+    if saida is None:
+        saida = np.empty(estados.shape[:-1] + (estados.shape[-1] + 2,), dtype=estados.dtype)
+    
+    saida[..., 1:-1] = estados
+    if circular and estados.shape[-1] > 0:
+        saida[..., 0] = estados[..., -1]
+        saida[..., -1] = estados[..., 0]
+    else:
+        saida[..., 0] = 0
+        saida[..., -1] = 0
+    
+    return saida
+
+
+def _empacotar(estado: np.ndarray) -> np.ndarray:
+    """
+    Empacota um estado binário em palavras de 64 bits.
+    
+    A célula i ocupa o bit (i % 64) da palavra (i // 64).
+    
+    Args:
+        estado: Array com os estados das células (0 ou 1)
+        
+    Returns:
+        Array np.uint64 com ceil(n/64) palavras
+    """
+    n_palavras = -(-len(estado) // BITS_POR_PALAVRA)
+    octetos = np.zeros(n_palavras * 8, dtype=np.uint8)
+    bits = np.packbits(np.asarray(estado, dtype=bool), bitorder='little')
+    octetos[:len(bits)] = bits
+    return octetos.view('<u8').astype(np.uint64)
+
+
+def _desempacotar(palavras: np.ndarray, tamanho: int) -> np.ndarray:
+    """
+    Reconstrói o array de células a partir das palavras empacotadas.
+    
+    Args:
+        palavras: Array np.uint64 produzido por _empacotar
+        tamanho: Número de células do estado
+        
+    Returns:
+        Array np.uint8 com uma célula por elemento
+    """
+    octetos = palavras.astype('<u8').view(np.uint8)
+    return np.unpackbits(octetos, count=tamanho, bitorder='little')
+
+
+@lru_cache(maxsize=1)
+def _expressoes_minimas() -> Tuple[str, ...]:
+    """
+    Encontra, para cada regra, a expressão bit a bit com menos operações.
+    
+    Cada expressão é identificada pela sua tabela verdade de 8 bits (o bit p
+    é a saída para a vizinhança p), que é o próprio número da regra. A busca
+    é em largura por custo: as expressões de custo k são o complemento (~)
+    das de custo k-1 e as combinações (&, |, ^) de duas de custos somando
+    k-1. Como só existem 256 tabelas, todas são alcançadas com poucas
+    operações (regra 30: esquerda ^ (centro | direita)).
+    
+    Returns:
+        Tupla com a expressão (sobre esquerda, centro e direita) de cada regra
+    """
+    melhores = {0b11110000: 'esquerda', 0b11001100: 'centro', 0b10101010: 'direita'}
+    niveis = [dict(melhores)]
+    while len(melhores) < 256:
+        custo = len(niveis)
+        novas = {}
+        
+        for tabela, expressao in niveis[custo - 1].items():
+            complemento = ~tabela & 0xFF
+            if complemento not in melhores and complemento not in novas:
+                novas[complemento] = '~' + expressao
+        
+        for custo_a in range((custo - 1) // 2 + 1):
+            custo_b = custo - 1 - custo_a
+            for tabela_a, expressao_a in niveis[custo_a].items():
+                for tabela_b, expressao_b in niveis[custo_b].items():
+                    for operador, tabela in (('&', tabela_a & tabela_b),
+                                             ('|', tabela_a | tabela_b),
+                                             ('^', tabela_a ^ tabela_b)):
+                        if tabela not in melhores and tabela not in novas:
+                            novas[tabela] = f'({expressao_a} {operador} {expressao_b})'
+        
+        niveis.append(novas)
+        melhores.update(novas)
+    
+    return tuple(melhores[regra] for regra in range(256))
+
+
+def _normalizar_regra(regra) -> int:
+    """
+    Converte o número da regra para int.
+    
+    Aceita inteiros (Python ou numpy) e floats com valor inteiro, como 30.0;
+    os demais valores não identificam uma regra.
+    
+    Args:
+        regra: Número da regra
+        
+    Returns:
+        Número da regra como int (o intervalo 0-255 não é verificado)
+    """
+    if isinstance(regra, (int, np.integer)):
+        return int(regra)
+    if isinstance(regra, (float, np.floating)) and float(regra).is_integer():
+        return int(regra)
+    raise ValueError(f"Regra deve ser um número inteiro, recebido {regra!r}")
+
+
+def _passo_regra(regra: int) -> Callable:
+    """
+    Retorna a função que aplica a regra como uma única expressão bit a bit.
+    
+    O código da função é gerado para a regra a partir da sua expressão com
+    menos operações (ver _expressoes_minimas) e guardado para ser
+    reaproveitado por todas as instâncias.
+    
+    A expressão opera bit a bit, então serve tanto para palavras empacotadas
+    quanto para arrays de células; nesse caso apenas o bit 0 do resultado
+    é válido (o complemento liga os demais bits).
+    
+    Args:
+        regra: Número da regra (0-255)
+        
+    Returns:
+        Função passo(esquerda, centro, direita) -> novo estado
+    """
+    passo = _PASSOS_POR_REGRA.get(regra)
+    if passo is not None:
+        return passo
+    
+    # As regras constantes (0 e 255) saem como x ^ x ou o seu complemento,
+    # o estado nulo ou cheio com o tipo da entrada
+    expressao = _expressoes_minimas()[regra]
+    codigo = f"def passo_regra_{regra}(esquerda, centro, direita):\n    return {expressao}\n"
+    escopo = {}
+    exec(codigo, escopo)
+    passo = _PASSOS_POR_REGRA[regra] = escopo[f'passo_regra_{regra}']
+    return passo
+
+
+def _passo_empacotado(palavras: np.ndarray, passo: Callable,
+                      tamanho: int, circular: bool) -> np.ndarray:
+    """
+    Calcula uma geração sobre o estado empacotado (64 células por operação).
+    
+    Os vizinhos esquerdo e direito de todas as células são obtidos deslocando
+    as palavras de um bit, com o transporte entre palavras vizinhas. A nova
+    geração é a expressão da regra aplicada às três palavras.
+    
+    Args:
+        palavras: Estado atual empacotado
+        passo: Expressão da regra gerada por _passo_regra
+        tamanho: Número de células do estado
+        circular: Se True, usa contorno circular; senão, vizinhos externos são 0
+        
+    Returns:
+        Novo estado empacotado
+    """
+    um = np.uint64(1)
+    ultimo_bit = np.uint64((tamanho - 1) % BITS_POR_PALAVRA)
+    transporte = np.uint64(BITS_POR_PALAVRA - 1)
+    
+    # Vizinho esquerdo da célula i é a célula i-1 (bit deslocado para cima)
+    esquerda = palavras << um
+    esquerda[1:] |= palavras[:-1] >> transporte
+    # Vizinho direito da célula i é a célula i+1 (bit deslocado para baixo)
+    direita = palavras >> um
+    direita[:-1] |= palavras[1:] << transporte
+    
+    if circular:
+        esquerda[0] |= (palavras[-1] >> ultimo_bit) & um
+        direita[-1] |= (palavras[0] & um) << ultimo_bit
+    
+    novo = passo(esquerda, palavras, direita)
+    
+    # Zerar os bits além da última célula
+    bits_validos = (tamanho - 1) % BITS_POR_PALAVRA + 1
+    novo[-1] &= np.uint64((1 << bits_validos) - 1)
+    
+    return novo
 
 
 class AutomatoElementar:
@@ -19,7 +267,8 @@ class AutomatoElementar:
     simples que dependem do estado da célula e de seus vizinhos.
     """
     
-    def __init__(self, regra: int, tamanho: int = 101, condicao_contorno: str = 'circular'):
+    def __init__(self, regra: int, tamanho: int = 101, condicao_contorno: str = 'circular',
+                 motor: str = 'auto', historico_compacto: bool = False):
         """
         Inicializa o autômato celular elementar.
         
@@ -27,25 +276,90 @@ class AutomatoElementar:
             regra: Número da regra (0-255) que define o comportamento do autômato
             tamanho: Número de células na grade unidimensional
             condicao_contorno: Tipo de condição de contorno ('circular' ou 'fixo')
+            motor: Implementação usada em evoluir ('auto', 'tabela', 'bits' ou 'numba')
+            historico_compacto: Se True, guarda o histórico com um bit por célula
+                (8x menos memória); os estados são desempacotados sob demanda
         """
+        regra = _normalizar_regra(regra)
         if not 0 <= regra <= 255:
             raise ValueError("Regra deve estar entre 0 e 255")
         
+        if motor not in MOTORES:
+            raise ValueError(f"Motor deve ser um de {MOTORES}")
+        
+        if motor == 'numba' and not _kernels.NUMBA_DISPONIVEL:
+            raise ValueError("Motor 'numba' requer o pacote numba instalado")
+        
         self.regra = regra
         self.tamanho = tamanho
         self.condicao_contorno = condicao_contorno
         
-        # Converter regra para tabela de lookup binária
-        self.tabela_regra = self._criar_tabela_regra(regra)
+        if motor == 'auto':
+            if _kernels.NUMBA_DISPONIVEL:
+                motor = 'numba'
+            elif tamanho >= LIMIAR_MOTOR_BITS:
+                motor = 'bits'
+            else:
+                motor = 'tabela'
+        self.motor = motor
+        self.historico_compacto = historico_compacto
         
-        # Estado atual e histórico
-        self.estado_atual = np.zeros(tamanho, dtype=int)
-        self.historico = []
-        self.geracao_atual = 0
+        # A evolução usa o próprio número da regra como tabela, indexada por
+        # esquerda<<2 | centro<<1 | direita; a versão em dicionário
+        # (tabela_regra) só é montada se for consultada
+        self._tabela_regra = None
+        
+        # Regra como expressão bit a bit, gerada uma vez por regra
+        self._passo = _passo_regra(regra)
+        
+        # Estado atual e histórico (linhas iniciais de um buffer np.uint8,
+        # com um byte por célula ou, no modo compacto, oito células por byte).
+        # O estado é preenchido e o buffer alocado uma única vez, em resetar
+        self._largura_buffer = (tamanho + 7) // 8 if historico_compacto else tamanho
+        self._estado = np.empty(tamanho, dtype=np.uint8)
+        
+        # Estado com uma célula de borda de cada lado (ver _estender),
+        # reaproveitado a cada passo no lugar de índices com módulo
+        self._estendido = np.empty(tamanho + 2, dtype=np.uint8)
         
         # Inicializar com uma única célula ativa no centro
         self.resetar()
     
+    @property
+    def estado_atual(self) -> np.ndarray:
+        """
+        Estado atual do autômato.
+        
+        O array é alocado uma vez e reaproveitado: cada evolução copia a
+        última geração para ele, sem alocar um novo estado por chamada.
+        Para guardar o estado de uma geração, use uma cópia.
+        
+        Returns:
+            Array (tamanho,) np.uint8
+        """
+        return self._estado
+    
+    @estado_atual.setter
+    def estado_atual(self, estado: np.ndarray):
+        # Copiado para o array existente (convertido para np.uint8)
+        self._estado[:] = estado
+    
+    @property
+    def tabela_regra(self) -> dict:
+        """
+        Tabela da regra como dicionário, montada no primeiro acesso.
+        
+        A evolução não usa o dicionário (os motores extraem o bit do número
+        da regra); ele serve para consulta e para o cálculo célula a célula
+        de referência.
+        
+        Returns:
+            Dicionário mapeando (esquerda, centro, direita) para o novo estado
+        """
+        if self._tabela_regra is None:
+            self._tabela_regra = self._criar_tabela_regra(self.regra)
+        return self._tabela_regra
+    
     def _criar_tabela_regra(self, regra: int) -> dict:
         """
         Cria a tabela de lookup para a regra especificada.
@@ -73,29 +387,153 @@ class AutomatoElementar:
         
         return tabela
     
-    def resetar(self, estado_inicial: Optional[np.ndarray] = None):
+    def resetar(self, estado_inicial: Optional[np.ndarray] = None,
+                geracoes_previstas: int = 0):
         """
         Reseta o autômato para o estado inicial.
         
         Args:
             estado_inicial: Estado inicial customizado. Se None, usa célula central ativa.
+            geracoes_previstas: Gerações para as quais o histórico já é reservado,
+                evitando realocações ao evoluir em muitas chamadas curtas
         """
         if estado_inicial is not None:
             if len(estado_inicial) != self.tamanho:
                 raise ValueError(f"Estado inicial deve ter {self.tamanho} elementos")
-            self.estado_atual = np.array(estado_inicial, dtype=int)
+            self.estado_atual = estado_inicial
         else:
             # Estado padrão: apenas célula central ativa
-            self.estado_atual = np.zeros(self.tamanho, dtype=int)
-            self.estado_atual[self.tamanho // 2] = 1
+            self._estado.fill(0)
+            self._estado[self.tamanho // 2] = 1
         
-        self.historico = [self.estado_atual.copy()]
+        self._buffer = np.empty((1 + max(geracoes_previstas, 0), self._largura_buffer),
+                                dtype=np.uint8)
+        self._buffer[0] = self._linha_buffer(self.estado_atual)
         self.geracao_atual = 0
+        
+        # Detecção incremental de período: hash do estado -> primeira geração.
+        # O ciclo só é repetido sem calcular enquanto a trajetória desde o
+        # reset não tiver sido interrompida por uma alteração de estado_atual
+        self._estados_vistos = {}
+        self._periodo = None
+        self._inicio_ciclo = None
+        self._trajetoria_continua = True
+        self._alteracao = None
+        self._registrar_estados(self._buffer[:1], 0)
+    
+    def _reservar_geracoes(self, linhas: int):
+        """
+        Garante espaço no buffer do histórico para pelo menos `linhas` estados.
+        
+        A capacidade cresce geometricamente, de modo que várias chamadas curtas
+        a evoluir não realocam o histórico a cada vez.
+        
+        Args:
+            linhas: Número total de estados que o buffer deve comportar
+        """
+        capacidade = len(self._buffer)
+        if linhas <= capacidade:
+            return
+        
+        novo = np.empty((max(linhas, 2 * capacidade), self._largura_buffer), dtype=np.uint8)
+        ocupadas = self.geracao_atual + 1
+        novo[:ocupadas] = self._buffer[:ocupadas]
+        self._buffer = novo
+    
+    def _linha_buffer(self, estados: np.ndarray) -> np.ndarray:
+        """
+        Converte estado(s) para o formato das linhas do buffer do histórico.
+        
+        Args:
+            estados: Estado (tamanho,) ou estados empilhados (n, tamanho)
+            
+        Returns:
+            Os mesmos estados como np.uint8, empacotados no modo compacto
+        """
+        estados = np.asarray(estados, dtype=np.uint8)
+        if self.historico_compacto:
+            return np.packbits(estados, axis=-1, bitorder='little')
+        return estados
+    
+    @property
+    def historico(self) -> np.ndarray:
+        """
+        Todos os estados desde o último reset, como matriz somente leitura.
+        
+        Returns:
+            Matriz (gerações x células) np.uint8
+        """
+        linhas = self._buffer[:self.geracao_atual + 1]
+        if self.historico_compacto:
+            linhas = np.unpackbits(linhas, axis=1, count=self.tamanho, bitorder='little')
+        linhas.flags.writeable = False
+        return linhas
+    
+    def _registrar_estados(self, estados, geracao_inicial: int):
+        """
+        Registra novos estados para a detecção de período.
+        
+        Como a evolução é determinística, a primeira repetição de um estado
+        fixa o período do ciclo; a partir daí nada mais precisa ser registrado.
+        
+        As chaves são os hashes dos estados empacotados (um bit por célula):
+        o dicionário guarda uma chave por geração até o ciclo aparecer, e um
+        inteiro por geração ocupa bem menos que o estado inteiro. Um hash
+        repetido só fixa o período depois de conferido contra a linha
+        registrada no histórico; se as linhas diferem (colisão), o estado
+        não é registrado e o ciclo é detectado em um de seus sucessores.
+        
+        Args:
+            estados: Linhas consecutivas do buffer do histórico (já empacotadas
+                no modo compacto)
+            geracao_inicial: Geração correspondente ao primeiro estado
+        """
+        if self._periodo is not None:
+            return
+        
+        linhas = estados
+        if not self.historico_compacto:
+            estados = np.packbits(estados, axis=-1, bitorder='little')
+        
+        vistos = self._estados_vistos
+        for indice, estado in enumerate(estados):
+            chave = hash(estado.tobytes())
+            anterior = vistos.get(chave)
+            geracao = geracao_inicial + indice
+            if anterior is None:
+                vistos[chave] = geracao
+            elif np.array_equal(self._linha_registrada(anterior), linhas[indice]):
+                self._periodo = geracao - anterior
+                self._inicio_ciclo = anterior
+                self._estados_vistos = {}
+                return
+    
+    def _linha_registrada(self, geracao: int) -> np.ndarray:
+        """
+        Linha com a qual o estado de uma geração foi registrado em _registrar_estados.
+        
+        Um estado_atual alterado diretamente é registrado na geração atual,
+        mas a linha do histórico nessa geração guarda o estado anterior à
+        alteração.
+        
+        Args:
+            geracao: Geração registrada
+            
+        Returns:
+            Linha no formato do buffer do histórico
+        """
+        if self._alteracao is not None and self._alteracao[0] == geracao:
+            return self._alteracao[1]
+        return self._buffer[geracao]
     
     def _obter_vizinhanca(self, posicao: int) -> Tuple[int, int, int]:
         """
         Obtém a vizinhança de uma célula (esquerda, centro, direita).
         
+        A evolução não usa este método: proximo_passo e os motores calculam as
+        vizinhanças de todas as células de uma vez. Ele serve a consultas
+        pontuais, como chave de tabela_regra.
+        
         Args:
             posicao: Posição da célula
             
@@ -121,15 +559,18 @@ class AutomatoElementar:
         Returns:
             Novo estado do autômato
         """
-        novo_estado = np.zeros(self.tamanho, dtype=int)
-        
-        for i in range(self.tamanho):
-            vizinhanca = self._obter_vizinhanca(i)
-            novo_estado[i] = self.tabela_regra[vizinhanca]
+        if self.condicao_contorno not in ('circular', 'fixo'):
+            raise ValueError("Condição de contorno deve ser 'circular' ou 'fixo'")
         
-        return novo_estado
+        # Todas as células de uma vez: a expressão da regra sobre as três
+        # fatias do estado estendido (só o bit 0 de cada célula é válido)
+        estado = np.asarray(self.estado_atual, dtype=np.uint8)
+        estendido = _estender(estado, self.condicao_contorno == 'circular', self._estendido)
+        novo = self._passo(estendido[:-2], estendido[1:-1], estendido[2:])
+        novo &= 1
+        return novo
     
-    def evoluir(self, geracoes: int = 1) -> List[np.ndarray]:
+    def evoluir(self, geracoes: int = 1) -> np.ndarray:
         """
         Evolui o autômato por um número especificado de gerações.
         
@@ -137,26 +578,270 @@ class AutomatoElementar:
             geracoes: Número de gerações para evoluir
             
         Returns:
-            Lista com todos os estados (incluindo o inicial)
+            Matriz com todos os estados (incluindo o inicial)
         """
-        for _ in range(geracoes):
-            self.estado_atual = self.proximo_passo()
-            self.historico.append(self.estado_atual.copy())
-            self.geracao_atual += 1
+        if self.condicao_contorno not in ('circular', 'fixo'):
+            raise ValueError("Condição de contorno deve ser 'circular' ou 'fixo'")
+        
+        circular = self.condicao_contorno == 'circular'
+        self._reservar_geracoes(self.geracao_atual + geracoes + 1)
+        
+        # Um estado_atual alterado diretamente não segue do histórico (a
+        # comparação dos bytes evita o custo fixo de np.array_equal, que
+        # domina em chamadas curtas)
+        ultimo_registrado = self._buffer[self.geracao_atual]
+        atual = self._linha_buffer(self.estado_atual)
+        alterado = atual.tobytes() != ultimo_registrado.tobytes()
+        if alterado:
+            # Os estados e o período da trajetória anterior não valem para a
+            # nova: a detecção recomeça a partir do estado alterado
+            self._trajetoria_continua = False
+            self._estados_vistos = {}
+            self._periodo = None
+            self._inicio_ciclo = None
+            self._alteracao = (self.geracao_atual, atual.copy())
+            self._registrar_estados(atual[np.newaxis], self.geracao_atual)
+        
+        # Evoluir em etapas crescentes: assim que um ciclo é detectado, as
+        # gerações restantes são cópias de gerações já calculadas
+        restantes = geracoes
+        etapa = GERACOES_PRIMEIRA_ETAPA
+        while restantes > 0:
+            if self._periodo is not None and self._trajetoria_continua:
+                self._repetir_ciclo(restantes)
+                break
+            
+            passos = min(restantes, etapa)
+            if self.historico_compacto:
+                self._evoluir_compacto(passos, circular)
+            else:
+                self._evoluir_direto(passos, circular, alterado)
+            
+            alterado = False
+            restantes -= passos
+            etapa *= 2
         
         return self.historico
     
+    def _repetir_ciclo(self, geracoes: int):
+        """
+        Preenche as próximas gerações repetindo o ciclo já detectado.
+        
+        Args:
+            geracoes: Número de gerações a preencher
+        """
+        inicio = self.geracao_atual + 1
+        fim = inicio + geracoes
+        
+        # Dentro do ciclo cada geração repete a de um período antes, e o último
+        # período já está no buffer. As linhas prontas são copiadas em blocos
+        # que dobram de tamanho (sempre múltiplos do período, preservando a
+        # fase): poucas cópias contíguas, sem índices nem cópia intermediária
+        origem = inicio - self._periodo
+        preenchidas = inicio
+        while preenchidas < fim:
+            linhas = min(preenchidas - origem, fim - preenchidas)
+            self._buffer[preenchidas:preenchidas + linhas] = self._buffer[origem:origem + linhas]
+            preenchidas += linhas
+        
+        ultima = self._buffer[fim - 1]
+        if self.historico_compacto:
+            ultima = np.unpackbits(ultima, count=self.tamanho, bitorder='little')
+        self.estado_atual = ultima
+        self.geracao_atual += geracoes
+    
+    def _evoluir_direto(self, geracoes: int, circular: bool, alterado: bool = True):
+        """
+        Evolui escrevendo as novas gerações diretamente no buffer do histórico.
+        
+        Args:
+            geracoes: Número de gerações para evoluir
+            circular: Se True, usa contorno circular
+            alterado: Se False, estado_atual é igual à última linha do
+                histórico e o bloco parte dela sem cópias
+        """
+        # O bloco começa na linha do estado atual
+        inicio = self.geracao_atual
+        bloco = self._buffer[inicio:inicio + geracoes + 1]
+        
+        if alterado:
+            # estado_atual foi alterado diretamente: evoluir a partir dele
+            # sem modificar a última linha já registrada no histórico
+            ultimo_registrado = bloco[0].copy()
+            bloco[0] = self.estado_atual
+            self._evoluir_bloco(bloco, circular)
+            bloco[0] = ultimo_registrado
+        else:
+            self._evoluir_bloco(bloco, circular)
+        
+        self._registrar_estados(bloco[1:], inicio + 1)
+        self.estado_atual = bloco[-1]
+        self.geracao_atual += geracoes
+    
+    def _evoluir_compacto(self, geracoes: int, circular: bool):
+        """
+        Evolui com histórico compacto, empacotando as gerações em blocos.
+        
+        As gerações são calculadas em um bloco temporário de no máximo
+        GERACOES_POR_BLOCO_COMPACTO linhas, que é empacotado no buffer.
+        
+        Args:
+            geracoes: Número de gerações para evoluir
+            circular: Se True, usa contorno circular
+        """
+        if self.motor == 'bits' or self.motor == 'numba':
+            # Motores de palavras empacotadas: as linhas compactas saem prontas
+            self._evoluir_bits_compacto(geracoes, circular)
+            return
+        
+        por_bloco = min(geracoes, GERACOES_POR_BLOCO_COMPACTO)
+        bloco = np.empty((por_bloco + 1, self.tamanho), dtype=np.uint8)
+        bloco[0] = self.estado_atual
+        
+        restantes = geracoes
+        while restantes > 0:
+            passos = min(restantes, por_bloco)
+            parte = bloco[:passos + 1]
+            self._evoluir_bloco(parte, circular)
+            
+            inicio = self.geracao_atual + 1
+            self._buffer[inicio:inicio + passos] = self._linha_buffer(parte[1:])
+            self._registrar_estados(self._buffer[inicio:inicio + passos], inicio)
+            self.geracao_atual += passos
+            
+            bloco[0] = parte[-1]
+            restantes -= passos
+        
+        self.estado_atual = bloco[0]
+    
+    def _evoluir_bits_compacto(self, geracoes: int, circular: bool):
+        """
+        Evolui o estado empacotado gravando as palavras direto no histórico compacto.
+        
+        As linhas do histórico compacto são os primeiros bytes das palavras
+        (ambos little-endian), de modo que nenhuma geração é desempacotada.
+        
+        Args:
+            geracoes: Número de gerações para evoluir
+            circular: Se True, usa contorno circular
+        """
+        inicio = self.geracao_atual + 1
+        linhas = self._buffer[inicio:inicio + geracoes]
+        
+        if _kernels.NUMBA_DISPONIVEL:
+            # Todas as gerações do bloco no núcleo compilado, copiadas de uma vez
+            bloco = self._evoluir_empacotado_numba(self.estado_atual, geracoes, circular)
+            linhas[:] = bloco[1:].view(np.uint8)[:, :self._largura_buffer]
+            palavras = bloco[-1]
+        else:
+            palavras = _empacotar(self.estado_atual)
+            for linha in linhas:
+                palavras = _passo_empacotado(palavras, self._passo, self.tamanho, circular)
+                linha[:] = palavras.astype('<u8', copy=False).view(np.uint8)[:self._largura_buffer]
+        
+        self._registrar_estados(linhas, inicio)
+        self.geracao_atual += geracoes
+        self.estado_atual = _desempacotar(palavras, self.tamanho)
+    
+    def _evoluir_empacotado_numba(self, estado: np.ndarray, geracoes: int,
+                                  circular: bool) -> np.ndarray:
+        """
+        Evolui o estado empacotado com o núcleo compilado.
+        
+        Args:
+            estado: Estado inicial (uma célula por elemento)
+            geracoes: Número de gerações para evoluir
+            circular: Se True, usa contorno circular
+            
+        Returns:
+            Matriz (gerações+1, palavras) '<u8' com o estado inicial na linha 0
+        """
+        palavras = _empacotar(estado)
+        bloco = np.empty((geracoes + 1, len(palavras)), dtype='<u8')
+        bloco[0] = palavras
+        _kernels.evoluir_empacotado(bloco, self.regra, self.tamanho, circular)
+        return bloco
+    
+    def _evoluir_bloco(self, bloco: np.ndarray, circular: bool):
+        """
+        Preenche as linhas 1.. do bloco a partir da linha 0 com o motor escolhido.
+        
+        Args:
+            bloco: Matriz (gerações+1, tamanho) np.uint8
+            circular: Se True, usa contorno circular
+        """
+        if self.motor == 'bits':
+            self._evoluir_bits(bloco, circular)
+        elif self.motor == 'numba':
+            self._evoluir_numba(bloco, circular)
+        else:
+            self._evoluir_tabela(bloco, circular)
+    
+    def _evoluir_tabela(self, bloco: np.ndarray, circular: bool):
+        """
+        Preenche as linhas 1.. do bloco a partir da linha 0 com a expressão da regra.
+        
+        Args:
+            bloco: Matriz (gerações+1, tamanho) np.uint8
+            circular: Se True, usa contorno circular
+        """
+        # A expressão gerada para a regra (ver _passo_regra) tem no máximo
+        # cinco operações sobre as três fatias do estado estendido, contra as
+        # seis de montar o índice da vizinhança e extrair o bit da regra com
+        # um deslocamento variável, que o NumPy não vetoriza
+        estendido = self._estendido
+        passo = self._passo
+        for t in range(len(bloco) - 1):
+            _estender(bloco[t], circular, estendido)
+            np.bitwise_and(passo(estendido[:-2], estendido[1:-1], estendido[2:]), 1,
+                           out=bloco[t + 1])
+    
+    def _evoluir_bits(self, bloco: np.ndarray, circular: bool):
+        """
+        Preenche as linhas 1.. do bloco a partir da linha 0 usando o estado empacotado.
+        
+        Args:
+            bloco: Matriz (gerações+1, tamanho) np.uint8
+            circular: Se True, usa contorno circular
+        """
+        if _kernels.NUMBA_DISPONIVEL:
+            empacotado = self._evoluir_empacotado_numba(bloco[0], len(bloco) - 1, circular)
+            bloco[1:] = np.unpackbits(empacotado[1:].view(np.uint8), axis=1,
+                                      count=self.tamanho, bitorder='little')
+            return
+        
+        palavras = _empacotar(bloco[0])
+        for t in range(len(bloco) - 1):
+            palavras = _passo_empacotado(palavras, self._passo, self.tamanho, circular)
+            bloco[t + 1] = _desempacotar(palavras, self.tamanho)
+    
+    def _evoluir_numba(self, bloco: np.ndarray, circular: bool):
+        """
+        Preenche as linhas 1.. do bloco a partir da linha 0 com o núcleo compilado.
+        
+        Args:
+            bloco: Matriz (gerações+1, tamanho) np.uint8
+            circular: Se True, usa contorno circular
+        """
+        if self.tamanho >= LIMIAR_MOTOR_PARALELO and _kernels.get_num_threads() > 1:
+            _kernels.evoluir_regra_paralelo(bloco, self.regra, circular)
+        else:
+            _kernels.evoluir_regra(bloco, self.regra, circular)
+    
     def obter_matriz_evolucao(self) -> np.ndarray:
         """
         Retorna a evolução completa como uma matriz 2D.
         
         Returns:
-            Matriz onde cada linha representa uma geração
+            Matriz onde cada linha representa uma geração (somente leitura)
         """
-        if not self.historico:
-            return np.array([])
+        matriz = self.historico
         
-        return np.array(self.historico)
+        if len(matriz) == 0:
+            return np.empty((0, self.tamanho), dtype=np.uint8)
+        
+        # Sem compactação o histórico já é uma matriz contígua: nenhuma cópia
+        return matriz
     
     def detectar_periodo(self, janela_busca: int = 20) -> Optional[int]:
         """
@@ -168,22 +853,8 @@ class AutomatoElementar:
         Returns:
             Tamanho do período detectado ou None se não periódico
         """
-        if len(self.historico) < 2 * janela_busca:
-            return None
-        
-        estado_atual = self.historico[-1]
-        
-        # Procurar por períodos de tamanho 1 até janela_busca
-        for periodo in range(1, min(janela_busca + 1, len(self.historico) // 2)):
-            # Verificar se os últimos 'periodo' estados se repetem
-            repete = True
-            for i in range(periodo):
-                if not np.array_equal(self.historico[-(i+1)], self.historico[-(i+1+periodo)]):
-                    repete = False
-                    break
-            
-            if repete:
-                return periodo
+        if self._periodo is not None and self._periodo <= janela_busca:
+            return self._periodo
         
         return None
     
@@ -196,6 +867,28 @@ class AutomatoElementar:
         """
         return np.mean(self.estado_atual)
     
+    def obter_densidades(self) -> np.ndarray:
+        """
+        Calcula a densidade de células ativas em cada geração do histórico.
+        
+        Returns:
+            Array com uma densidade (0.0 a 1.0) por geração
+        """
+        if self.historico_compacto:
+            # Conta os bits diretamente nas linhas empacotadas
+            contagens = _contar_bits(self._buffer[:self.geracao_atual + 1])
+            return contagens / self.tamanho
+        
+        # Uma única redução sobre a matriz em vez de uma chamada por geração;
+        # a soma inteira por linha evita converter cada célula para float
+        matriz = self.obter_matriz_evolucao()
+        if _kernels.NUMBA_DISPONIVEL and matriz.size:
+            # Núcleo compilado: uma passada sem o buffer de conversão do NumPy
+            contagens = np.empty(len(matriz), dtype=np.uint32)
+            _kernels.contar_vivas(matriz, contagens)
+            return contagens / self.tamanho
+        return matriz.sum(axis=1, dtype=np.uint32) / self.tamanho
+    
     def obter_estatisticas(self) -> dict:
         """
         Retorna estatísticas sobre a evolução do autômato.
@@ -203,21 +896,21 @@ class AutomatoElementar:
         Returns:
             Dicionário com estatísticas diversas
         """
-        if not self.historico:
-            return {}
+        n_estados = self.geracao_atual + 1
         
-        matriz = self.obter_matriz_evolucao()
-        densidades = [np.mean(estado) for estado in self.historico]
+        # Uma única passada sobre o histórico; o restante opera sobre
+        # o vetor de densidades (uma por geração) e o período já registrado
+        densidades = self.obter_densidades()
         
         return {
             'regra': self.regra,
-            'geracoes': len(self.historico),
+            'geracoes': n_estados,
             'tamanho': self.tamanho,
-            'densidade_inicial': densidades[0],
-            'densidade_final': densidades[-1],
-            'densidade_media': np.mean(densidades),
-            'densidade_max': np.max(densidades),
-            'densidade_min': np.min(densidades),
+            'densidade_inicial': float(densidades[0]),
+            'densidade_final': float(densidades[-1]),
+            'densidade_media': float(densidades.mean()),
+            'densidade_max': float(densidades.max()),
+            'densidade_min': float(densidades.min()),
             'periodo_detectado': self.detectar_periodo(),
             'condicao_contorno': self.condicao_contorno
         }
@@ -229,3 +922,146 @@ class AutomatoElementar:
     def __repr__(self) -> str:
         """Representação técnica do autômato."""
         return f"AutomatoElementar(regra={self.regra}, tamanho={self.tamanho}, geracao={self.geracao_atual})"
+
+
+def evoluir_em_lote(regras: List[int], tamanho: int = 101, geracoes: int = 100,
+                    estado_inicial: Optional[np.ndarray] = None,
+                    condicao_contorno: str = 'circular') -> np.ndarray:
+    """
+    Evolui várias regras simultaneamente a partir do mesmo estado inicial.
+    
+    Os estados de todas as regras formam uma matriz (n_regras, tamanho) e cada
+    geração é calculada para todas elas de uma só vez, indexando a tabela
+    (n_regras, 8) de cada regra com as vizinhanças da sua linha. Com numba
+    instalado, todo o lote é evoluído pelo núcleo compilado.
+    
+    Args:
+        regras: Lista de regras (0-255)
+        tamanho: Número de células
+        geracoes: Número de gerações para evoluir
+        estado_inicial: Estado inicial comum (se None, célula central ativa)
+        condicao_contorno: Tipo de condição de contorno ('circular' ou 'fixo')
+        
+    Returns:
+        Array np.uint8 (n_regras, geracoes+1, tamanho) com a evolução de cada regra
+    """
+    return _evoluir_lote(regras, tamanho, geracoes, estado_inicial,
+                         condicao_contorno, contar=False)[0]
+
+
+def evoluir_em_lote_com_contagens(regras: List[int], tamanho: int = 101, geracoes: int = 100,
+                                  estado_inicial: Optional[np.ndarray] = None,
+                                  condicao_contorno: str = 'circular'
+                                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Evolui várias regras como evoluir_em_lote e conta células de cada geração.
+    
+    Com numba instalado, as contagens são acumuladas na mesma passada que
+    escreve cada geração, sem reler o histórico.
+    
+    Args:
+        regras: Lista de regras (0-255)
+        tamanho: Número de células
+        geracoes: Número de gerações para evoluir
+        estado_inicial: Estado inicial comum (se None, célula central ativa)
+        condicao_contorno: Tipo de condição de contorno ('circular' ou 'fixo')
+        
+    Returns:
+        Tupla (historicos, vivas, mudancas): o array (n_regras, geracoes+1, tamanho),
+        as células vivas de cada geração (n_regras, geracoes+1) e as células que
+        mudaram em cada transição (n_regras, geracoes)
+    """
+    return _evoluir_lote(regras, tamanho, geracoes, estado_inicial,
+                         condicao_contorno, contar=True)
+
+
+def _evoluir_lote(regras: List[int], tamanho: int, geracoes: int,
+                  estado_inicial: Optional[np.ndarray], condicao_contorno: str,
+                  contar: bool) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """Implementação comum de evoluir_em_lote e evoluir_em_lote_com_contagens."""
+    regras = np.asarray(regras, dtype=np.int64).reshape(-1)
+    if np.any((regras < 0) | (regras > 255)):
+        raise ValueError("Regra deve estar entre 0 e 255")
+    
+    if condicao_contorno not in ('circular', 'fixo'):
+        raise ValueError("Condição de contorno deve ser 'circular' ou 'fixo'")
+    
+    circular = condicao_contorno == 'circular'
+    
+    historicos = np.empty((len(regras), geracoes + 1, tamanho), dtype=np.uint8)
+    if estado_inicial is not None:
+        if len(estado_inicial) != tamanho:
+            raise ValueError(f"Estado inicial deve ter {tamanho} elementos")
+        historicos[:, 0] = estado_inicial
+    else:
+        historicos[:, 0] = 0
+        historicos[:, 0, tamanho // 2] = 1
+    
+    if _kernels.NUMBA_DISPONIVEL:
+        # Evolução e contagens em uma única passada compilada
+        vivas = np.empty((len(regras), geracoes + 1), dtype=np.int64)
+        mudancas = np.empty((len(regras), geracoes), dtype=np.int64)
+        _kernels.evoluir_lote_contando(historicos, regras, circular, vivas, mudancas)
+    else:
+        # Novo estado de cada célula: bit (esquerda<<2 | centro<<1 | direita)
+        # do número da regra da sua linha, por deslocamento em uint8
+        regras8 = regras.astype(np.uint8)[:, np.newaxis]
+        
+        # Buffers reaproveitados entre gerações
+        estendido = np.empty((len(regras), tamanho + 2), dtype=np.uint8)
+        indices = np.empty((len(regras), tamanho), dtype=np.uint8)
+        termo = np.empty_like(indices)
+        
+        for t in range(geracoes):
+            _estender(historicos[:, t], circular, estendido)
+            np.left_shift(estendido[:, :-2], 2, out=indices)
+            np.left_shift(estendido[:, 1:-1], 1, out=termo)
+            indices |= termo
+            indices |= estendido[:, 2:]
+            novos = historicos[:, t + 1]
+            np.right_shift(regras8, indices, out=novos)
+            novos &= 1
+        
+        vivas = mudancas = None
+        if contar:
+            vivas = historicos.sum(axis=2, dtype=np.int64)
+            mudancas = np.count_nonzero(historicos[:, 1:] != historicos[:, :-1], axis=2)
+    
+    if not contar:
+        return historicos, None, None
+    
+    return historicos, vivas, mudancas
+
+
+def detectar_periodo_matriz(historico, janela_busca: int = 20) -> Optional[int]:
+    """
+    Detecta se uma evolução terminou em um ciclo periódico.
+    
+    Args:
+        historico: Matriz de evolução ou lista de estados (gerações x células)
+        janela_busca: Tamanho máximo do período a ser detectado
+        
+    Returns:
+        Tamanho do período detectado ou None se não periódico
+    """
+    matriz = np.asarray(historico, dtype=np.uint8)
+    if matriz.ndim != 2 or len(matriz) < 2:
+        return None
+    
+    # Cada linha empacotada vira uma única chave opaca; np.unique devolve,
+    # para todas as gerações de uma vez, a primeira ocorrência do seu estado
+    linhas = np.ascontiguousarray(np.packbits(matriz, axis=1))
+    if linhas.shape[1] == 0:
+        return 1 if 1 <= janela_busca else None
+    chaves = linhas.view(np.dtype((np.void, linhas.shape[1]))).ravel()
+    _, primeiras, inverso = np.unique(chaves, return_index=True, return_inverse=True)
+    anteriores = primeiras[inverso.ravel()]
+    
+    # A primeira repetição de um estado determina o período do ciclo
+    repeticoes = np.flatnonzero(anteriores < np.arange(len(matriz)))
+    if len(repeticoes) == 0:
+        return None
+    
+    geracao = repeticoes[0]
+    periodo = int(geracao - anteriores[geracao])
+    return periodo if periodo <= janela_busca else None
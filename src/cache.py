@@ -0,0 +1,63 @@
+"""
+Cache de autômatos já evoluídos.
+
+Demonstrações e experimentos evoluem repetidamente as mesmas regras com os
+mesmos parâmetros. Este módulo guarda os autômatos evoluídos para que cada
+combinação (regra, tamanho, gerações, estado inicial) seja simulada uma vez.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+try:
+    from .automato_elementar import AutomatoElementar
+except ImportError:
+    from automato_elementar import AutomatoElementar
+
+
+def automato_evoluido(regra: int, tamanho: int = 101, geracoes: int = 100,
+                      estado_inicial: Optional[np.ndarray] = None,
+                      condicao_contorno: str = 'circular') -> AutomatoElementar:
+    """
+    Retorna um autômato evoluído, reaproveitando simulações anteriores.
+
+    A instância retornada é compartilhada entre todas as chamadas com os
+    mesmos argumentos: use-a apenas para leitura (visualização, estatísticas,
+    análise). Para continuar a evolução, crie um AutomatoElementar próprio.
+
+    Args:
+        regra: Número da regra (0-255)
+        tamanho: Número de células
+        geracoes: Número de gerações a evoluir
+        estado_inicial: Estado inicial customizado (se None, célula central ativa)
+        condicao_contorno: Tipo de condição de contorno ('circular' ou 'fixo')
+
+    Returns:
+        Autômato evoluído
+    """
+    chave_estado = None
+    if estado_inicial is not None:
+        chave_estado = np.asarray(estado_inicial, dtype=np.uint8).tobytes()
+
+    return _automato_evoluido(regra, tamanho, geracoes, chave_estado, condicao_contorno)
+
+
+@lru_cache(maxsize=64)
+def _automato_evoluido(regra: int, tamanho: int, geracoes: int,
+                       chave_estado: Optional[bytes],
+                       condicao_contorno: str) -> AutomatoElementar:
+    """Cria e evolui o autômato correspondente a uma chave do cache."""
+    automato = AutomatoElementar(regra, tamanho, condicao_contorno)
+
+    if chave_estado is not None:
+        automato.resetar(np.frombuffer(chave_estado, dtype=np.uint8))
+
+    automato.evoluir(geracoes)
+    return automato
+
+
+def limpar_cache():
+    """Descarta todos os autômatos guardados no cache."""
+    _automato_evoluido.cache_clear()
@@ -5,13 +5,32 @@ Este módulo implementa a classificação de Wolfram para autômatos celulares
 elementares em quatro classes baseadas em seu comportamento emergente.
 """
 
+import atexit
+import os
+import pickle
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 
 try:
-    from .automato_elementar import AutomatoElementar
+    from .automato_elementar import (AutomatoElementar, evoluir_em_lote_com_contagens,
+                                     detectar_periodo_matriz, _normalizar_regra)
 except ImportError:
-    from automato_elementar import AutomatoElementar
+    from automato_elementar import (AutomatoElementar, evoluir_em_lote_com_contagens,
+                                    detectar_periodo_matriz, _normalizar_regra)
+
+
+def _classificar_bloco(parametros: Tuple[List[int], int, int]) -> Dict[int, Dict]:
+    """
+    Classifica um bloco de regras por análise (pode rodar em outro processo).
+    
+    Args:
+        parametros: Tupla (regras, tamanho, geracoes)
+        
+    Returns:
+        Dicionário mapeando regra para classificação
+    """
+    regras, tamanho, geracoes = parametros
+    return ClassificadorWolfram().classificar_em_lote(regras, tamanho, geracoes)
 
 
 class ClassificadorWolfram:
@@ -34,15 +53,15 @@ class ClassificadorWolfram:
         1: 2, 2: 2, 3: 2, 4: 2, 5: 2, 6: 2, 7: 2, 9: 2, 10: 2, 11: 2,
         12: 2, 13: 2, 14: 2, 15: 2, 19: 2, 23: 2, 24: 2, 25: 2, 26: 2,
         27: 2, 28: 2, 29: 2, 31: 2, 33: 2, 34: 2, 35: 2, 36: 2, 37: 2,
-        38: 2, 39: 2, 50: 2, 51: 2, 54: 2, 55: 2, 56: 2, 57: 2, 58: 2,
+        38: 2, 39: 2, 50: 2, 51: 2, 55: 2, 56: 2, 57: 2, 58: 2,
         62: 2, 90: 2, 94: 2, 102: 2, 150: 2, 154: 2, 158: 2, 178: 2,
         184: 2, 188: 2, 190: 2, 194: 2, 198: 2, 206: 2, 218: 2, 220: 2,
         222: 2, 250: 2,
         
         # Classe III - Caótico
         18: 3, 22: 3, 30: 3, 45: 3, 60: 3, 73: 3, 75: 3, 86: 3, 89: 3,
-        101: 3, 105: 3, 106: 3, 109: 3, 120: 3, 122: 3, 124: 3, 129: 3,
-        131: 3, 133: 3, 135: 3, 137: 3, 139: 3, 141: 3, 149: 3, 151: 3,
+        101: 3, 105: 3, 106: 3, 109: 3, 120: 3, 122: 3, 129: 3,
+        131: 3, 133: 3, 135: 3, 139: 3, 141: 3, 149: 3, 151: 3,
         161: 3, 163: 3, 165: 3, 167: 3, 169: 3, 171: 3, 182: 3, 183: 3,
         195: 3, 225: 3,
         
@@ -50,9 +69,47 @@ class ClassificadorWolfram:
         41: 4, 54: 4, 110: 4, 124: 4, 137: 4, 193: 4
     }
     
-    def __init__(self):
-        """Inicializa o classificador."""
+    # A mesma classificação indexada pela regra (0 = sem classificação conhecida)
+    _CLASSES_CONHECIDAS = np.zeros(256, dtype=np.int8)
+    _CLASSES_CONHECIDAS[list(CLASSIFICACAO_CONHECIDA)] = list(CLASSIFICACAO_CONHECIDA.values())
+    
+    def __init__(self, arquivo_cache: Optional[str] = None):
+        """
+        Inicializa o classificador.
+        
+        Os resultados de análise computacional ficam em cache_classificacao,
+        indexados por (regra, tamanho, geracoes), e não são recalculados.
+        
+        Args:
+            arquivo_cache: Arquivo pickle onde o cache é persistido. Se existir,
+                é carregado agora; o cache é salvo nele ao final do programa
+        """
         self.cache_classificacao = {}
+        self.arquivo_cache = arquivo_cache
+        
+        if arquivo_cache is not None:
+            if os.path.exists(arquivo_cache):
+                with open(arquivo_cache, 'rb') as f:
+                    self.cache_classificacao = pickle.load(f)
+            atexit.register(self.salvar_cache)
+    
+    def salvar_cache(self, arquivo: Optional[str] = None):
+        """
+        Grava o cache de classificações em disco.
+        
+        Args:
+            arquivo: Arquivo de destino (se None, usa arquivo_cache)
+        """
+        arquivo = arquivo or self.arquivo_cache
+        if arquivo is None:
+            raise ValueError("Nenhum arquivo de cache definido")
+        
+        diretorio = os.path.dirname(arquivo)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        
+        with open(arquivo, 'wb') as f:
+            pickle.dump(self.cache_classificacao, f)
     
     def classificar_regra(self, regra: int, tamanho: int = 101, geracoes: int = 200,
                          usar_cache: bool = True) -> Dict:
@@ -66,24 +123,70 @@ class ClassificadorWolfram:
             usar_cache: Se deve usar classificação conhecida
             
         Returns:
-            Dicionário com informações da classificação
+            Dicionário com informações da classificação (resultados de análise
+            vêm do cache e são compartilhados: use-os apenas para leitura)
         """
-        if usar_cache and regra in self.CLASSIFICACAO_CONHECIDA:
-            classe = self.CLASSIFICACAO_CONHECIDA[regra]
-            return {
-                'regra': regra,
-                'classe': classe,
-                'nome_classe': self._nome_classe(classe),
-                'descricao': self._descricao_classe(classe),
-                'fonte': 'literatura',
-                'confianca': 1.0
-            }
+        classe = self._classe_conhecida(regra) if usar_cache else 0
+        if classe:
+            return self._resultado_literatura(regra, classe)
+        
+        # Análise computacional, reaproveitada se já foi feita
+        chave = (regra, tamanho, geracoes)
+        resultado = self.cache_classificacao.get(chave)
+        if resultado is None:
+            automato = AutomatoElementar(regra, tamanho)
+            automato.evoluir(geracoes)
+            resultado = self._resultado_analise(regra, automato.obter_matriz_evolucao())
+            self.cache_classificacao[chave] = resultado
+        
+        return resultado
+    
+    def _classe_conhecida(self, regra) -> int:
+        """
+        Retorna a classe da literatura para a regra, ou 0 se não houver.
         
-        # Análise computacional
-        automato = AutomatoElementar(regra, tamanho)
-        automato.evoluir(geracoes)
+        Args:
+            regra: Número da regra (valores fora de 0-255 não têm classe)
+            
+        Returns:
+            Classe de Wolfram (1-4) ou 0
+        """
+        if isinstance(regra, (int, np.integer)) and 0 <= regra <= 255:
+            return int(self._CLASSES_CONHECIDAS[int(regra)])
+        return 0
+    
+    def _resultado_literatura(self, regra: int, classe: int) -> Dict:
+        """
+        Monta o resultado de uma classificação conhecida da literatura.
         
-        resultado = self._analisar_comportamento(automato)
+        Args:
+            regra: Número da regra
+            classe: Classe de Wolfram da regra
+            
+        Returns:
+            Dicionário com informações da classificação
+        """
+        return {
+            'regra': regra,
+            'classe': classe,
+            'nome_classe': self._nome_classe(classe),
+            'descricao': self._descricao_classe(classe),
+            'fonte': 'literatura',
+            'confianca': 1.0
+        }
+    
+    def _resultado_analise(self, regra: int, matriz: np.ndarray) -> Dict:
+        """
+        Monta o resultado de uma classificação obtida por análise computacional.
+        
+        Args:
+            regra: Número da regra
+            matriz: Matriz de evolução da regra
+            
+        Returns:
+            Dicionário com informações da classificação
+        """
+        resultado = self._analisar_matriz(matriz)
         resultado['regra'] = regra
         resultado['fonte'] = 'analise'
         
@@ -99,31 +202,77 @@ class ClassificadorWolfram:
         Returns:
             Dicionário com análise comportamental
         """
-        matriz = automato.obter_matriz_evolucao()
+        return self._analisar_matriz(automato.obter_matriz_evolucao())
+    
+    def _analisar_matriz(self, matriz: np.ndarray) -> Dict:
+        """
+        Analisa uma matriz de evolução para classificação.
         
-        # Métricas para classificação
-        homogeneidade = self._calcular_homogeneidade(matriz)
-        periodicidade = self._detectar_periodicidade(automato)
-        complexidade = self._calcular_complexidade(matriz)
-        estabilidade = self._calcular_estabilidade(matriz)
+        Args:
+            matriz: Matriz de evolução (gerações x células)
+            
+        Returns:
+            Dicionário com análise comportamental
+        """
+        return self._analisar_lote(np.asarray(matriz)[np.newaxis])[0]
+    
+    def _analisar_lote(self, historicos: np.ndarray, vivas: Optional[np.ndarray] = None,
+                       mudancas: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        Analisa várias matrizes de evolução de mesmo formato de uma só vez.
         
-        # Lógica de classificação
-        classe, confianca = self._determinar_classe(
-            homogeneidade, periodicidade, complexidade, estabilidade
-        )
+        As métricas baseadas em densidades e transições são calculadas com
+        reduções sobre o tensor inteiro; apenas a periodicidade é avaliada
+        regra a regra.
         
-        return {
-            'classe': classe,
-            'nome_classe': self._nome_classe(classe),
-            'descricao': self._descricao_classe(classe),
-            'confianca': confianca,
-            'metricas': {
-                'homogeneidade': homogeneidade,
-                'periodicidade': periodicidade,
-                'complexidade': complexidade,
-                'estabilidade': estabilidade
-            }
-        }
+        Args:
+            historicos: Tensor (regras x gerações x células)
+            vivas: Células vivas de cada geração (regras x gerações), se já contadas
+            mudancas: Células que mudaram em cada transição (regras x gerações-1),
+                se já contadas
+            
+        Returns:
+            Lista com a análise comportamental de cada matriz, na mesma ordem
+        """
+        # Densidade de cada geração, calculada uma vez e compartilhada
+        if vivas is not None:
+            densidades = vivas / historicos.shape[2]
+        else:
+            densidades = historicos.mean(axis=2)
+        
+        # Métricas para classificação
+        homogeneidades = self._homogeneidade_lote(historicos, densidades)
+        complexidades = self._complexidade_lote(historicos, mudancas)
+        estabilidades = self._estabilidade_lote(historicos, densidades)
+        quasi_periodos = self._quasi_periodicidade_lote(historicos)
+        
+        analises = []
+        for matriz, homogeneidade, complexidade, estabilidade, quasi_periodo in zip(
+                historicos, homogeneidades, complexidades, estabilidades, quasi_periodos):
+            homogeneidade = float(homogeneidade)
+            complexidade = float(complexidade)
+            estabilidade = float(estabilidade)
+            periodicidade = self._detectar_periodicidade(matriz, int(quasi_periodo))
+            
+            # Lógica de classificação
+            classe, confianca = self._determinar_classe(
+                homogeneidade, periodicidade, complexidade, estabilidade
+            )
+            
+            analises.append({
+                'classe': classe,
+                'nome_classe': self._nome_classe(classe),
+                'descricao': self._descricao_classe(classe),
+                'confianca': confianca,
+                'metricas': {
+                    'homogeneidade': homogeneidade,
+                    'periodicidade': periodicidade,
+                    'complexidade': complexidade,
+                    'estabilidade': estabilidade
+                }
+            })
+        
+        return analises
     
     def _calcular_homogeneidade(self, matriz: np.ndarray) -> float:
         """
@@ -135,32 +284,48 @@ class ClassificadorWolfram:
         Returns:
             Valor entre 0 (heterogêneo) e 1 (homogêneo)
         """
-        if len(matriz) < 10:
-            return 0.0
+        return float(self._homogeneidade_lote(np.asarray(matriz)[np.newaxis])[0])
+    
+    def _homogeneidade_lote(self, historicos: np.ndarray,
+                            densidades: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calcula a homogeneidade do padrão final de cada matriz do lote.
         
-        # Analisar últimas 10 gerações
-        ultimas_geracoes = matriz[-10:]
+        Args:
+            historicos: Tensor (regras x gerações x células)
+            densidades: Densidade de cada geração (regras x gerações), se já calculada
+            
+        Returns:
+            Array com um valor entre 0 (heterogêneo) e 1 (homogêneo) por regra
+        """
+        if historicos.shape[1] < 10:
+            return np.zeros(len(historicos))
         
-        # Calcular variância média das últimas gerações
-        variancias = [np.var(geracao) for geracao in ultimas_geracoes]
-        variancia_media = np.mean(variancias)
+        if densidades is None:
+            densidades = historicos[:, -10:].mean(axis=2)
         
-        # Normalizar (0 = homogêneo, 0.25 = máximo teórico para variância binária)
-        homogeneidade = 1.0 - min(variancia_media / 0.25, 1.0)
+        # Variância média das últimas 10 gerações de cada regra; para estados
+        # binários a variância de uma geração é d * (1 - d), sem nova passada
+        ultimas = densidades[:, -10:]
+        variancia_media = (ultimas * (1.0 - ultimas)).mean(axis=1)
         
-        return homogeneidade
+        # Normalizar (0 = homogêneo, 0.25 = máximo teórico para variância binária)
+        return 1.0 - np.minimum(variancia_media / 0.25, 1.0)
     
-    def _detectar_periodicidade(self, automato: AutomatoElementar) -> Dict:
+    def _detectar_periodicidade(self, matriz: np.ndarray,
+                                quasi_periodo: Optional[int] = None) -> Dict:
         """
         Detecta padrões periódicos na evolução.
         
         Args:
-            automato: Instância do autômato
+            matriz: Matriz de evolução
+            quasi_periodo: Resultado de _quasi_periodicidade_lote para a matriz
+                (0 se não detectado), se já calculado
             
         Returns:
             Dicionário com informações de periodicidade
         """
-        periodo = automato.detectar_periodo(janela_busca=50)
+        periodo = detectar_periodo_matriz(matriz, janela_busca=50)
         
         if periodo is not None:
             return {
@@ -170,9 +335,9 @@ class ClassificadorWolfram:
             }
         
         # Verificar quasi-periodicidade
-        matriz = automato.obter_matriz_evolucao()
         if len(matriz) > 20:
-            quasi_periodo = self._detectar_quasi_periodicidade(matriz)
+            if quasi_periodo is None:
+                quasi_periodo = self._detectar_quasi_periodicidade(matriz)
             if quasi_periodo:
                 return {
                     'periodo': quasi_periodo,
@@ -196,24 +361,56 @@ class ClassificadorWolfram:
         Returns:
             Período detectado ou None
         """
-        if len(matriz) < 40:
-            return None
+        periodo = int(self._quasi_periodicidade_lote(np.asarray(matriz)[np.newaxis])[0])
+        return periodo or None
+    
+    def _quasi_periodicidade_lote(self, historicos: np.ndarray) -> np.ndarray:
+        """
+        Detecta quasi-periodicidade de cada matriz do lote analisando correlações.
         
-        # Analisar últimas 30 gerações
-        ultimas = matriz[-30:]
-        
-        # Procurar padrões similares
-        for periodo in range(2, 15):
-            correlacoes = []
-            for i in range(len(ultimas) - periodo):
-                corr = np.corrcoef(ultimas[i], ultimas[i + periodo])[0, 1]
-                if not np.isnan(corr):
-                    correlacoes.append(corr)
+        A correlação de Pearson entre cada par de gerações vem de uma matriz de
+        Gram das linhas centradas; as médias por período são obtidas de uma
+        vez para todas as regras e todos os períodos de 2 a 14.
+        
+        Args:
+            historicos: Tensor (regras x gerações x células)
             
-            if correlacoes and np.mean(correlacoes) > 0.8:
-                return periodo
+        Returns:
+            Array com o período de cada regra (0 se não detectado)
+        """
+        if historicos.shape[1] < 40:
+            return np.zeros(len(historicos), dtype=np.int64)
         
-        return None
+        # Analisar últimas 30 gerações
+        ultimas = historicos[:, -30:].astype(np.float64)
+        n_ultimas = ultimas.shape[1]
+        
+        # Produto interno das linhas centradas, normalizado pelas normas
+        centradas = ultimas - ultimas.mean(axis=2, keepdims=True)
+        normas = np.sqrt(np.einsum('rij,rij->ri', centradas, centradas))
+        produtos = centradas @ centradas.transpose(0, 2, 1)
+        escalas = normas[:, :, np.newaxis] * normas[:, np.newaxis, :]
+        
+        # Linhas constantes não têm correlação definida e são ignoradas
+        definidas = escalas > 0
+        correlacoes = np.clip(np.divide(produtos, escalas, out=np.zeros_like(produtos),
+                                        where=definidas), -1.0, 1.0)
+        
+        # Pares (i, i + periodo) de todos os períodos, agrupados por período
+        periodos = np.arange(2, 15)
+        pares_por_periodo = n_ultimas - periodos
+        i = np.concatenate([np.arange(n) for n in pares_por_periodo])
+        j = i + np.repeat(periodos, pares_por_periodo)
+        inicios = np.concatenate(([0], np.cumsum(pares_por_periodo)[:-1]))
+        
+        validas = definidas[:, i, j]
+        somas = np.add.reduceat(np.where(validas, correlacoes[:, i, j], 0.0), inicios, axis=1)
+        contagens = np.add.reduceat(validas.astype(np.int64), inicios, axis=1)
+        medias = np.divide(somas, contagens, out=np.zeros_like(somas), where=contagens > 0)
+        
+        # Menor período com correlação média acima do limiar
+        similares = (contagens > 0) & (medias > 0.8)
+        return np.where(similares.any(axis=1), periodos[similares.argmax(axis=1)], 0)
     
     def _calcular_complexidade(self, matriz: np.ndarray) -> float:
         """
@@ -225,27 +422,38 @@ class ClassificadorWolfram:
         Returns:
             Valor de complexidade normalizado
         """
-        if len(matriz) < 2:
-            return 0.0
+        return float(self._complexidade_lote(np.asarray(matriz)[np.newaxis])[0])
+    
+    def _complexidade_lote(self, historicos: np.ndarray,
+                           mudancas: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calcula a complexidade de cada matriz do lote.
         
-        # Calcular entropia das transições
-        entropias = []
-        for i in range(1, len(matriz)):
-            diferenca = np.abs(matriz[i] - matriz[i-1])
-            transicoes = np.sum(diferenca)
-            total_celulas = len(matriz[i])
+        Args:
+            historicos: Tensor (regras x gerações x células)
+            mudancas: Células que mudaram em cada transição, se já contadas
             
-            if total_celulas > 0:
-                entropia = transicoes / total_celulas
-                entropias.append(entropia)
+        Returns:
+            Array com a complexidade normalizada de cada regra
+        """
+        n_regras, n_geracoes, total_celulas = historicos.shape
         
-        if not entropias:
-            return 0.0
+        if n_geracoes < 2 or total_celulas == 0:
+            return np.zeros(n_regras)
+        
+        # Fração de células que mudam em cada transição (comparação direta:
+        # estados np.uint8 não admitem subtração com sinal)
+        if mudancas is None:
+            mudancas = np.count_nonzero(historicos[:, 1:] != historicos[:, :-1], axis=2)
+        entropias = mudancas / total_celulas
         
         # Complexidade como variabilidade da entropia
-        complexidade = np.std(entropias) if len(entropias) > 1 else np.mean(entropias)
+        if n_geracoes > 2:
+            complexidade = entropias.std(axis=1)
+        else:
+            complexidade = entropias.mean(axis=1)
         
-        return min(complexidade, 1.0)
+        return np.minimum(complexidade, 1.0)
     
     def _calcular_estabilidade(self, matriz: np.ndarray) -> float:
         """
@@ -257,23 +465,33 @@ class ClassificadorWolfram:
         Returns:
             Valor de estabilidade (0 = instável, 1 = estável)
         """
-        if len(matriz) < 10:
-            return 0.0
+        return float(self._estabilidade_lote(np.asarray(matriz)[np.newaxis])[0])
+    
+    def _estabilidade_lote(self, historicos: np.ndarray,
+                           densidades: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calcula a estabilidade temporal de cada matriz do lote.
         
-        # Dividir em duas metades
-        meio = len(matriz) // 2
-        primeira_metade = matriz[:meio]
-        segunda_metade = matriz[meio:]
+        Args:
+            historicos: Tensor (regras x gerações x células)
+            densidades: Densidade de cada geração (regras x gerações), se já calculada
+            
+        Returns:
+            Array com a estabilidade (0 = instável, 1 = estável) de cada regra
+        """
+        if historicos.shape[1] < 10:
+            return np.zeros(len(historicos))
         
-        # Calcular densidade média de cada metade
-        densidade1 = np.mean([np.mean(geracao) for geracao in primeira_metade])
-        densidade2 = np.mean([np.mean(geracao) for geracao in segunda_metade])
+        # Densidade média de cada metade da evolução
+        if densidades is None:
+            densidades = historicos.mean(axis=2)
+        meio = historicos.shape[1] // 2
+        densidade1 = densidades[:, :meio].mean(axis=1)
+        densidade2 = densidades[:, meio:].mean(axis=1)
         
         # Estabilidade baseada na diferença de densidades
-        diferenca = abs(densidade1 - densidade2)
-        estabilidade = 1.0 - min(diferenca, 1.0)
-        
-        return estabilidade
+        diferenca = np.abs(densidade1 - densidade2)
+        return 1.0 - np.minimum(diferenca, 1.0)
     
     def _determinar_classe(self, homogeneidade: float, periodicidade: Dict,
                           complexidade: float, estabilidade: float) -> Tuple[int, float]:
@@ -331,20 +549,118 @@ class ClassificadorWolfram:
         }
         return descricoes.get(classe, "Comportamento não classificado")
     
+    def classificar_em_lote(self, regras: List[int], tamanho: int = 101,
+                            geracoes: int = 200, paralelo: bool = False) -> Dict[int, Dict]:
+        """
+        Classifica várias regras por análise computacional, em um único lote.
+        
+        Todas as regras são evoluídas juntas (ver evoluir_em_lote_com_contagens)
+        e as métricas são calculadas sobre o tensor de históricos resultante,
+        reaproveitando as contagens feitas durante a evolução.
+        A classificação conhecida da literatura não é consultada; regras já
+        presentes em cache_classificacao não são evoluídas de novo.
+        
+        Args:
+            regras: Lista de regras para classificar (0-255)
+            tamanho: Tamanho da grade para análise
+            geracoes: Número de gerações para análise
+            paralelo: Se True, divide as regras em blocos analisados em processos
+            
+        Returns:
+            Dicionário mapeando regra para classificação
+        """
+        regras = list(dict.fromkeys(regras))
+        pendentes = [regra for regra in regras
+                     if (regra, tamanho, geracoes) not in self.cache_classificacao]
+        
+        n_blocos = min(os.cpu_count() or 1, len(pendentes))
+        if paralelo and n_blocos > 1:
+            # Regras são independentes; cada processo analisa um bloco em lote
+            from concurrent.futures import ProcessPoolExecutor
+            parametros = [(pendentes[i::n_blocos], tamanho, geracoes) for i in range(n_blocos)]
+            with ProcessPoolExecutor(max_workers=n_blocos) as executor:
+                for resultados in executor.map(_classificar_bloco, parametros):
+                    for regra, analise in resultados.items():
+                        self.cache_classificacao[(regra, tamanho, geracoes)] = analise
+        elif pendentes:
+            historicos, vivas, mudancas = evoluir_em_lote_com_contagens(
+                pendentes, tamanho, geracoes)
+            analises = self._analisar_lote(historicos, vivas, mudancas)
+            for regra, analise in zip(pendentes, analises):
+                analise['regra'] = regra
+                analise['fonte'] = 'analise'
+                self.cache_classificacao[(regra, tamanho, geracoes)] = analise
+        
+        return {regra: self.cache_classificacao[(regra, tamanho, geracoes)]
+                for regra in regras}
+    
     def classificar_multiplas_regras(self, regras: List[int], **kwargs) -> Dict[int, Dict]:
         """
         Classifica múltiplas regras.
         
+        As classes conhecidas de todas as regras são obtidas de uma vez da
+        tabela indexada pela regra; apenas as demais são analisadas, juntas,
+        em um único lote (ver classificar_em_lote).
+        
+        Regras com valor inteiro em float (30.0) equivalem à regra inteira;
+        regras não inteiras recebem um resultado com 'erro'. Argumentos não
+        reconhecidos levantam TypeError.
+        
         Args:
             regras: Lista de regras para classificar
-            **kwargs: Argumentos passados para classificar_regra
+            **kwargs: Argumentos passados para classificar_regra ('tamanho',
+                'geracoes' e 'usar_cache'); 'paralelo' é repassado para
+                classificar_em_lote
             
         Returns:
             Dicionário mapeando regra para classificação
         """
+        desconhecidos = set(kwargs) - {'paralelo', 'tamanho', 'geracoes', 'usar_cache'}
+        if desconhecidos:
+            raise TypeError(f"Argumentos não reconhecidos: {sorted(desconhecidos)}")
+        
+        paralelo = kwargs.pop('paralelo', False)
+        tamanho = kwargs.get('tamanho', 101)
+        geracoes = kwargs.get('geracoes', 200)
+        usar_cache = kwargs.get('usar_cache', True)
+        
         resultados = {}
+        pendentes = []
         
+        # Normalizar antes de remover repetições: 30.0 e 30 são a mesma regra
+        chaves = []
         for regra in regras:
+            try:
+                chaves.append(_normalizar_regra(regra))
+            except ValueError as e:
+                resultados[regra] = {
+                    'regra': regra,
+                    'erro': str(e),
+                    'classe': None
+                }
+                chaves.append(regra)
+        
+        distintas = [regra for regra in dict.fromkeys(chaves) if regra not in resultados]
+        validas = [regra for regra in distintas
+                   if isinstance(regra, (int, np.integer)) and 0 <= regra <= 255]
+        
+        # Classes conhecidas de todas as regras válidas em uma consulta
+        if usar_cache:
+            classes = self._CLASSES_CONHECIDAS[np.array(validas, dtype=np.int64)]
+        else:
+            classes = np.zeros(len(validas), dtype=np.int8)
+        
+        for regra, classe in zip(validas, classes.tolist()):
+            if classe:
+                resultados[regra] = self._resultado_literatura(regra, classe)
+            else:
+                pendentes.append(regra)
+        
+        # Regras inválidas: classificar_regra produz a mensagem de erro
+        for regra in distintas:
+            if regra in resultados or regra in pendentes:
+                continue
+            
             try:
                 resultados[regra] = self.classificar_regra(regra, **kwargs)
             except Exception as e:
@@ -354,14 +670,21 @@ class ClassificadorWolfram:
                     'classe': None
                 }
         
-        return resultados
+        # Analisar de uma vez todas as regras sem classificação conhecida
+        resultados.update(self.classificar_em_lote(pendentes, tamanho, geracoes, paralelo))
+        
+        # Manter a ordem das regras recebidas
+        return {chave: resultados[chave] for chave in chaves}
     
-    def obter_estatisticas_classificacao(self, regras: List[int] = None) -> Dict:
+    def obter_estatisticas_classificacao(self, regras: List[int] = None,
+                                         paralelo: bool = False) -> Dict:
         """
         Obtém estatísticas sobre a distribuição de classes.
         
         Args:
             regras: Lista de regras (se None, usa todas as 256)
+            paralelo: Se True, as regras sem classificação conhecida são
+                analisadas em vários processos
             
         Returns:
             Estatísticas da classificação
@@ -369,7 +692,7 @@ class ClassificadorWolfram:
         if regras is None:
             regras = list(range(256))
         
-        classificacoes = self.classificar_multiplas_regras(regras)
+        classificacoes = self.classificar_multiplas_regras(regras, paralelo=paralelo)
         
         # Contar por classe
         contadores = {1: 0, 2: 0, 3: 0, 4: 0, None: 0}
@@ -6,11 +6,26 @@ análise de padrões e outras operações úteis.
 """
 
 import numpy as np
-import random
 from typing import List, Dict, Tuple, Optional, Callable
 import json
 import csv
 from datetime import datetime
+from functools import lru_cache
+
+try:
+    from . import _kernels
+    from .automato_elementar import _contar_bits
+except ImportError:
+    import _kernels
+    from automato_elementar import _contar_bits
+
+
+# Gerador compartilhado, usado quando nenhuma semente é informada
+_RNG = np.random.default_rng()
+
+# Maior janela contada em uma tabela de 2**n contagens (núcleo compilado
+# ou np.bincount); janelas maiores são contadas ordenando os códigos
+_JANELA_MAXIMA_TABELA = 16
 
 
 def gerar_estado_aleatorio(tamanho: int, densidade: float = 0.5, 
@@ -26,10 +41,18 @@ def gerar_estado_aleatorio(tamanho: int, densidade: float = 0.5,
     Returns:
         Array numpy com estado inicial
     """
-    if semente is not None:
-        np.random.seed(semente)
+    # A comparação também rejeita NaN
+    if not 0 <= densidade <= 1:
+        raise ValueError("Densidade deve estar entre 0 e 1")
+    
+    # Densidades extremas não dependem do sorteio (random() está em [0, 1))
+    if densidade == 0 or densidade == 1:
+        return np.full(tamanho, densidade == 1, dtype=np.uint8)
     
-    return np.random.choice([0, 1], size=tamanho, p=[1-densidade, densidade])
+    rng = np.random.default_rng(semente) if semente is not None else _RNG
+    
+    # A máscara booleana já tem um byte por célula: reinterpretada, sem cópia
+    return (rng.random(tamanho) < densidade).view(np.uint8)
 
 
 def gerar_estado_impulso(tamanho: int, posicao: Optional[int] = None) -> np.ndarray:
@@ -43,7 +66,7 @@ def gerar_estado_impulso(tamanho: int, posicao: Optional[int] = None) -> np.ndar
     Returns:
         Array numpy com estado inicial
     """
-    estado = np.zeros(tamanho, dtype=int)
+    estado = np.zeros(tamanho, dtype=np.uint8)
     if posicao is None:
         posicao = tamanho // 2
     estado[posicao] = 1
@@ -63,7 +86,14 @@ def gerar_estado_bloco(tamanho: int, tamanho_bloco: int,
     Returns:
         Array numpy com estado inicial
     """
-    estado = np.zeros(tamanho, dtype=int)
+    # Estados determinísticos: cada chamada recebe uma cópia do modelo em cache
+    return _estado_bloco(tamanho, tamanho_bloco, posicao).copy()
+
+
+@lru_cache(maxsize=32)
+def _estado_bloco(tamanho: int, tamanho_bloco: int, posicao: Optional[int]) -> np.ndarray:
+    """Constrói (uma vez por combinação de parâmetros) o estado com bloco ativo."""
+    estado = np.zeros(tamanho, dtype=np.uint8)
     
     if posicao is None:
         posicao = (tamanho - tamanho_bloco) // 2
@@ -71,6 +101,7 @@ def gerar_estado_bloco(tamanho: int, tamanho_bloco: int,
     fim = min(posicao + tamanho_bloco, tamanho)
     estado[posicao:fim] = 1
     
+    estado.flags.writeable = False
     return estado
 
 
@@ -85,15 +116,25 @@ def gerar_estado_periodico(tamanho: int, padrao: List[int]) -> np.ndarray:
     Returns:
         Array numpy com estado inicial
     """
-    estado = np.zeros(tamanho, dtype=int)
-    
-    for i in range(tamanho):
-        estado[i] = padrao[i % len(padrao)]
+    return _estado_periodico(tamanho, tuple(padrao)).copy()
+
+
+@lru_cache(maxsize=32)
+def _estado_periodico(tamanho: int, padrao: Tuple[int, ...]) -> np.ndarray:
+    """Constrói (uma vez por combinação de parâmetros) o estado periódico."""
+    # np.tile copia o padrão em blocos; o excesso da última repetição é cortado
+    # (np.resize faz o mesmo, mas é dezenas de vezes mais lento em estados grandes)
+    modelo = np.array(padrao, dtype=np.uint8)
+    if modelo.size == 0:
+        estado = np.zeros(tamanho, dtype=np.uint8)
+    else:
+        estado = np.tile(modelo, -(-tamanho // modelo.size))[:tamanho]
     
+    estado.flags.writeable = False
     return estado
 
 
-def detectar_simetria(estado: np.ndarray) -> Dict[str, bool]:
+def detectar_simetria(estado: np.ndarray) -> Dict:
     """
     Detecta simetrias em um estado.
     
@@ -101,22 +142,82 @@ def detectar_simetria(estado: np.ndarray) -> Dict[str, bool]:
         estado: Array com o estado a analisar
         
     Returns:
-        Dicionário com tipos de simetria detectados
+        Dicionário com tipos de simetria detectados e o menor deslocamento
+        circular que preserva o estado ('periodo_translacional')
     """
+    estado = np.asarray(estado)
+    n = len(estado)
+    
+    # Cada par (i, n-1-i) aparece duas vezes na comparação com o estado
+    # invertido: basta comparar a primeira metade com a segunda invertida
+    metade = len(estado) // 2
+    inicio = estado[:metade]
+    fim_invertido = estado[len(estado) - metade:][::-1]  # view, sem cópia
+    
+    # Estados binários: estado == 1 - invertido equivale a diferir em toda
+    # posição; com tamanho ímpar a célula central é igual a si mesma. Os
+    # demais usam a comparação com o complemento
+    binario = estado.dtype.kind in 'biu' and (
+        estado.dtype == np.bool_ or estado.size == 0
+        or (estado.min() >= 0 and estado.max() <= 1))
+    if binario:
+        rotacional = n % 2 == 0 and not bool(np.any(inicio == fim_invertido))
+    else:
+        rotacional = bool(np.array_equal(estado, 1 - estado[::-1]))
+    
     return {
-        'reflexiva': np.array_equal(estado, estado[::-1]),
-        'rotacional_180': np.array_equal(estado, 1 - estado[::-1]),
-        'translacional': len(np.unique(estado)) == 1
+        'reflexiva': bool(np.array_equal(inicio, fim_invertido)),
+        'rotacional_180': rotacional,
+        'translacional': estado.size > 0 and not bool(np.any(estado != estado[0])),
+        'periodo_translacional': _periodo_translacional(estado)
     }
 
 
-def calcular_distancia_hamming(estado1: np.ndarray, estado2: np.ndarray) -> int:
+def _periodo_translacional(estado: np.ndarray) -> int:
+    """
+    Menor deslocamento circular d com estado == np.roll(estado, d).
+    
+    Os deslocamentos que preservam o estado são os múltiplos do período, que
+    divide o tamanho. Partindo do tamanho, cada fator primo é retirado
+    enquanto o deslocamento resultante ainda preserva o estado: são
+    O(log n) comparações de fatias (estado[d:] == estado[:-d]), sem cópias,
+    em vez de uma por divisor.
+    
+    Args:
+        estado: Array com o estado (1-D)
+        
+    Returns:
+        Período (o próprio tamanho se nenhum deslocamento menor preserva o estado)
+    """
+    n = len(estado)
+    periodo = n
+    restante = n
+    fator = 2
+    while restante > 1:
+        if fator * fator > restante:
+            # O que sobrou é primo
+            fator = restante
+        if restante % fator == 0:
+            while restante % fator == 0:
+                restante //= fator
+            while periodo % fator == 0 and np.array_equal(
+                    estado[periodo // fator:], estado[:n - periodo // fator]):
+                periodo //= fator
+        fator += 1
+    return periodo
+
+
+def calcular_distancia_hamming(estado1: np.ndarray, estado2: np.ndarray,
+                               empacotados: bool = False) -> int:
     """
     Calcula a distância de Hamming entre dois estados.
     
     Args:
         estado1: Primeiro estado
         estado2: Segundo estado
+        empacotados: Se True, os estados são bytes com oito células cada
+            (np.packbits, linhas do histórico compacto); a distância é a
+            contagem de bits do XOR, sem desempacotar
         
     Returns:
         Número de posições diferentes
@@ -124,7 +225,20 @@ def calcular_distancia_hamming(estado1: np.ndarray, estado2: np.ndarray) -> int:
     if len(estado1) != len(estado2):
         raise ValueError("Estados devem ter o mesmo tamanho")
     
-    return np.sum(estado1 != estado2)
+    estado1 = np.asarray(estado1)
+    estado2 = np.asarray(estado2)
+    
+    if empacotados:
+        return int(_contar_bits(np.bitwise_xor(estado1, estado2, dtype=np.uint8)))
+    
+    if (_kernels.NUMBA_DISPONIVEL and estado1.ndim == 1
+            and estado1.dtype == estado2.dtype == np.uint8):
+        # Comparação e contagem fundidas, sem a máscara intermediária
+        return int(_kernels.distancia_hamming(np.ascontiguousarray(estado1),
+                                              np.ascontiguousarray(estado2)))
+    
+    # count_nonzero conta a máscara diretamente, sem a soma genérica
+    return int(np.count_nonzero(estado1 != estado2))
 
 
 def encontrar_padroes_locais(matriz: np.ndarray, tamanho_janela: int = 3) -> Dict:
@@ -138,20 +252,74 @@ def encontrar_padroes_locais(matriz: np.ndarray, tamanho_janela: int = 3) -> Dic
     Returns:
         Dicionário com padrões encontrados e suas frequências
     """
-    padroes = {}
-    
-    for geracao in matriz:
-        for i in range(len(geracao) - tamanho_janela + 1):
-            padrao = tuple(geracao[i:i+tamanho_janela])
-            padroes[padrao] = padroes.get(padrao, 0) + 1
-    
-    # Ordenar por frequência
-    padroes_ordenados = dict(sorted(padroes.items(), key=lambda x: x[1], reverse=True))
+    matriz = np.asarray(matriz)
     
+    if matriz.ndim != 2 or matriz.shape[1] < tamanho_janela:
+        padroes_ordenados = {}
+    else:
+        # Os códigos inteiros guardam um bit por célula: só valem para
+        # matrizes binárias; as demais usam a comparação das janelas inteiras
+        binaria = matriz.dtype.kind in 'biu' and (
+            matriz.dtype == np.bool_ or matriz.size == 0
+            or (matriz.min() >= 0 and matriz.max() <= 1))
+        
+        if not binaria or tamanho_janela > 64:
+            # Todas as janelas de todas as gerações, na ordem de varredura
+            janelas = np.lib.stride_tricks.sliding_window_view(matriz, tamanho_janela, axis=1)
+            janelas = janelas.reshape(-1, tamanho_janela)
+            valores, primeiros, contagens = np.unique(janelas, axis=0, return_index=True,
+                                                      return_counts=True)
+        elif _kernels.NUMBA_DISPONIVEL and tamanho_janela <= _JANELA_MAXIMA_TABELA:
+            # Código deslizante compilado: uma contagem por código possível
+            contagens = np.zeros(1 << tamanho_janela, dtype=np.int64)
+            primeiros = np.full(1 << tamanho_janela, -1, dtype=np.int64)
+            _kernels.contar_janelas(np.ascontiguousarray(matriz, dtype=np.uint8),
+                                    tamanho_janela, contagens, primeiros)
+            valores = np.flatnonzero(contagens).astype(np.uint64)
+            primeiros = primeiros[valores]
+            contagens = contagens[valores]
+        else:
+            # Cada janela binária vira um inteiro (primeira célula no bit mais
+            # alto), acumulado coluna a coluna sobre todas as janelas de uma vez;
+            # a ordem de varredura é a de ravel
+            celulas = np.asarray(matriz, dtype=np.uint8)
+            n_janelas = celulas.shape[1] - tamanho_janela + 1
+            codigos = np.zeros((celulas.shape[0], n_janelas), dtype=np.uint64)
+            for k in range(tamanho_janela):
+                codigos <<= np.uint64(1)
+                codigos |= celulas[:, k:k + n_janelas]
+            codigos = codigos.ravel()
+            
+            if tamanho_janela <= _JANELA_MAXIMA_TABELA:
+                # Contagem direta por código, sem ordenar as janelas
+                codigos = codigos.astype(np.intp)
+                contagens = np.bincount(codigos, minlength=1 << tamanho_janela)
+                primeiros = np.full(1 << tamanho_janela, codigos.size, dtype=np.intp)
+                np.minimum.at(primeiros, codigos, np.arange(codigos.size))
+                valores = np.flatnonzero(contagens).astype(np.uint64)
+                primeiros = primeiros[valores]
+                contagens = contagens[valores]
+            else:
+                valores, primeiros, contagens = np.unique(codigos, return_index=True,
+                                                          return_counts=True)
+        
+        if valores.ndim == 1:
+            # Decodificar os códigos de volta em células
+            deslocamentos = np.arange(tamanho_janela - 1, -1, -1, dtype=np.uint64)
+            valores = (valores[:, np.newaxis] >> deslocamentos) & np.uint64(1)
+        
+        # Ordenar por frequência; empates seguem a ordem da primeira ocorrência.
+        # A conversão para listas Python é feita uma vez para todos os padrões
+        ordem = np.lexsort((primeiros, -contagens))
+        padroes_ordenados = dict(zip(map(tuple, valores[ordem].tolist()),
+                                     contagens[ordem].tolist()))
+    
+    # Com a ordenação acima, o padrão mais comum (o primeiro em caso de
+    # empate) é o primeiro item
     return {
         'padroes': padroes_ordenados,
         'total_padroes': len(padroes_ordenados),
-        'padrao_mais_comum': max(padroes_ordenados.items(), key=lambda x: x[1]) if padroes_ordenados else None
+        'padrao_mais_comum': next(iter(padroes_ordenados.items())) if padroes_ordenados else None
     }
 
 
@@ -165,12 +333,23 @@ def calcular_entropia(estado: np.ndarray) -> float:
     Returns:
         Valor da entropia
     """
-    # Contar frequências
-    valores, counts = np.unique(estado, return_counts=True)
-    probabilidades = counts / len(estado)
+    # Contar frequências. Estados de um byte por célula (como os binários do
+    # autômato) e inteiros não negativos de valor pequeno são contados com
+    # bincount, sem ordenar; os demais, com np.unique
+    estado = np.asarray(estado).ravel()
+    if estado.dtype in (np.uint8, np.bool_):
+        counts = np.bincount(estado.view(np.uint8))
+    elif estado.dtype.kind in 'iu' and estado.size and \
+            0 <= estado.min() and estado.max() <= max(estado.size, 255):
+        counts = np.bincount(estado.astype(np.intp, copy=False))
+    else:
+        valores, counts = np.unique(estado, return_counts=True)
+    counts = counts[counts > 0]
+    probabilidades = counts / estado.size
     
-    # Calcular entropia
-    entropia = -np.sum(probabilidades * np.log2(probabilidades + 1e-10))
+    # Calcular entropia. Só entram valores presentes, então log2 nunca recebe 0
+    # (e log2(1/p) dá 0.0, não -0.0, para estados homogêneos)
+    entropia = np.dot(probabilidades, np.log2(1 / probabilidades))
     
     return entropia
 
@@ -190,30 +369,34 @@ def calcular_dimensao_fractal(matriz: np.ndarray, metodo: str = 'box_counting')
         raise ValueError("Apenas 'box_counting' implementado")
     
     # Simplificação: usar apenas células ativas
-    pontos_ativos = np.argwhere(matriz == 1)
+    ativos = np.asarray(matriz) == 1
     
-    if len(pontos_ativos) == 0:
+    if not ativos.any():
         return 0.0
     
     # Box counting simplificado
     tamanhos_caixa = [2, 4, 8, 16, 32]
     contagens = []
     
-    altura, largura = matriz.shape
+    altura, largura = ativos.shape
     
+    # Cada caixa é a união das caixas do tamanho anterior que a compõem, de
+    # modo que cada nível reduz a grade do nível anterior, não a matriz inteira
+    caixas = ativos
+    tamanho_anterior = 1
     for tamanho in tamanhos_caixa:
         if tamanho > min(altura, largura):
             break
         
-        caixas_ocupadas = set()
-        
-        for ponto in pontos_ativos:
-            y, x = ponto
-            caixa_y = y // tamanho
-            caixa_x = x // tamanho
-            caixas_ocupadas.add((caixa_y, caixa_x))
+        # Completar com zeros até múltiplos do fator e reduzir cada bloco
+        fator = tamanho // tamanho_anterior
+        linhas, colunas = caixas.shape
+        grade = np.pad(caixas, ((0, -linhas % fator), (0, -colunas % fator)))
+        caixas = grade.reshape(grade.shape[0] // fator, fator,
+                               grade.shape[1] // fator, fator).any(axis=(1, 3))
+        tamanho_anterior = tamanho
         
-        contagens.append(len(caixas_ocupadas))
+        contagens.append(int(np.count_nonzero(caixas)))
     
     if len(contagens) < 2:
         return 0.0
@@ -222,8 +405,10 @@ def calcular_dimensao_fractal(matriz: np.ndarray, metodo: str = 'box_counting')
     log_tamanhos = np.log(tamanhos_caixa[:len(contagens)])
     log_contagens = np.log(contagens)
     
-    # Dimensão fractal = -coeficiente angular
-    coef = np.polyfit(log_tamanhos, log_contagens, 1)[0]
+    # Dimensão fractal = -coeficiente angular, pela fórmula fechada dos
+    # mínimos quadrados (polyfit resolveria o mesmo ajuste via SVD)
+    desvios = log_tamanhos - log_tamanhos.mean()
+    coef = (desvios * (log_contagens - log_contagens.mean())).sum() / (desvios * desvios).sum()
     
     return -coef
 
@@ -248,27 +433,44 @@ def exportar_dados(automato, formato: str = 'json', nome_arquivo: Optional[str]
         dados = {
             'regra': automato.regra,
             'tamanho': automato.tamanho,
-            'geracoes': len(automato.historico),
+            'geracoes': automato.geracao_atual + 1,
             'condicao_contorno': automato.condicao_contorno,
-            'estadisticas': automato.obter_estatisticas(),
-            'evolucao': [estado.tolist() for estado in automato.historico]
+            'estadisticas': automato.obter_estatisticas()
         }
         
+        # A evolução é escrita uma geração por linha, sem montar a lista
+        # aninhada de todo o histórico antes da gravação
+        cabecalho = json.dumps(dados, indent=2, ensure_ascii=False)
         caminho = f"{nome_arquivo}.json"
         with open(caminho, 'w', encoding='utf-8') as f:
-            json.dump(dados, f, indent=2, ensure_ascii=False)
+            f.write(cabecalho.rstrip()[:-1].rstrip())
+            f.write(',\n  "evolucao": [')
+            for geracao, estado in enumerate(automato.obter_matriz_evolucao()):
+                f.write(',\n    ' if geracao else '\n    ')
+                f.write(json.dumps(estado.tolist()))
+            f.write('\n  ]\n}\n')
     
     elif formato == 'csv':
         matriz = automato.obter_matriz_evolucao()
         caminho = f"{nome_arquivo}.csv"
         
-        with open(caminho, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            # Cabeçalho
-            writer.writerow(['geracao'] + [f'celula_{i}' for i in range(automato.tamanho)])
-            # Dados
-            for i, estado in enumerate(matriz):
-                writer.writerow([i] + estado.tolist())
+        cabecalho = ','.join(['geracao'] + [f'celula_{i}' for i in range(automato.tamanho)])
+        
+        # Células binárias: o texto ",c0,c1,...\r\n" de cada geração é montado
+        # de uma vez como bytes ASCII, sem formatar célula por célula
+        geracoes, tamanho = matriz.shape
+        corpo = np.full((geracoes, 2 * tamanho + 2), ord(','), dtype=np.uint8)
+        corpo[:, 1:2 * tamanho:2] = matriz + ord('0')
+        corpo[:, -2] = ord('\r')
+        corpo[:, -1] = ord('\n')
+        
+        texto = corpo.tobytes()
+        largura = corpo.shape[1]
+        
+        with open(caminho, 'wb') as f:
+            f.write(cabecalho.encode('utf-8') + b'\r\n')
+            f.write(b''.join(b'%d' % i + texto[i * largura:(i + 1) * largura]
+                             for i in range(geracoes)))
     
     elif formato == 'numpy':
         matriz = automato.obter_matriz_evolucao()
@@ -281,12 +483,14 @@ def exportar_dados(automato, formato: str = 'json', nome_arquivo: Optional[str]
     return caminho
 
 
-def carregar_dados(caminho: str):
+def carregar_dados(caminho: str, mapear_memoria: bool = True):
     """
     Carrega dados de autômato de arquivo.
     
     Args:
         caminho: Caminho do arquivo
+        mapear_memoria: Se True, arquivos .npy são mapeados em memória (somente
+            leitura): as gerações são lidas do disco apenas quando acessadas
         
     Returns:
         Dados carregados
@@ -296,16 +500,16 @@ def carregar_dados(caminho: str):
             return json.load(f)
     
     elif caminho.endswith('.csv'):
-        dados = []
         with open(caminho, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            header = next(reader)  # Pular cabeçalho
-            for row in reader:
-                dados.append([int(x) for x in row[1:]])  # Pular coluna de geração
-        return np.array(dados)
+            colunas = len(next(csv.reader(f)))  # Cabeçalho: geração + células
+            
+            # Leitura das células pelo parser em C do NumPy, pulando a coluna
+            # de geração (que não cabe em np.uint8)
+            return np.loadtxt(f, delimiter=',', dtype=np.uint8, ndmin=2,
+                              usecols=range(1, colunas))
     
     elif caminho.endswith('.npy'):
-        return np.load(caminho)
+        return np.load(caminho, mmap_mode='r' if mapear_memoria else None)
     
     else:
         raise ValueError("Formato de arquivo não suportado")
@@ -322,25 +526,36 @@ def analisar_convergencia(automato, tolerancia: float = 1e-6) -> Dict:
     Returns:
         Informações sobre convergência
     """
-    if len(automato.historico) < 2:
+    historico = automato.historico
+    
+    if len(historico) < 2:
         return {'convergiu': False, 'geracao_convergencia': None}
     
     # Analisar últimas gerações para detectar estabilidade
-    janela = min(10, len(automato.historico) // 2)
+    janela = min(10, len(historico) // 2)
     
-    if len(automato.historico) < janela:
+    if len(historico) < janela:
         return {'convergiu': False, 'geracao_convergencia': None}
     
-    ultimas_geracoes = automato.historico[-janela:]
-    
-    # Verificar se todas as gerações na janela são iguais
+    ultimas_geracoes = np.asarray(historico[-janela:])
     primeira = ultimas_geracoes[0]
-    for geracao in ultimas_geracoes[1:]:
-        if not np.array_equal(primeira, geracao):
-            return {'convergiu': False, 'geracao_convergencia': None}
+    
+    # Verificar se todas as gerações na janela são iguais (uma comparação só)
+    if not (ultimas_geracoes == primeira).all():
+        resultado = {'convergiu': False, 'geracao_convergencia': None}
+        
+        # Estados repetidos dentro da janela indicam um ciclo: o período é a
+        # distância entre a última geração e sua ocorrência anterior
+        _, inversos = np.unique(ultimas_geracoes, axis=0, return_inverse=True)
+        ocorrencias = np.flatnonzero(inversos.ravel() == inversos.ravel()[-1])
+        if len(ocorrencias) > 1:
+            resultado['tipo_convergencia'] = 'ciclo'
+            resultado['periodo'] = int(ocorrencias[-1] - ocorrencias[-2])
+        
+        return resultado
     
     # Se chegou aqui, convergiu
-    geracao_convergencia = len(automato.historico) - janela
+    geracao_convergencia = len(historico) - janela
     
     return {
         'convergiu': True,
@@ -350,17 +565,15 @@ def analisar_convergencia(automato, tolerancia: float = 1e-6) -> Dict:
     }
 
 
-def benchmark_regras(regras: List[int], tamanho: int = 101, geracoes: int = 100) -> Dict:
+def _benchmark_regra(parametros: Tuple[int, int, int]) -> Dict:
     """
-    Faz benchmark de múltiplas regras para comparação de performance.
+    Evolui uma regra e mede o tempo gasto (pode rodar em outro processo).
     
     Args:
-        regras: Lista de regras para testar
-        tamanho: Tamanho da grade
-        geracoes: Número de gerações
+        parametros: Tupla (regra, tamanho, gerações)
         
     Returns:
-        Resultados do benchmark
+        Medições da regra
     """
     import time
     try:
@@ -368,29 +581,65 @@ def benchmark_regras(regras: List[int], tamanho: int = 101, geracoes: int = 100)
     except ImportError:
         from automato_elementar import AutomatoElementar
     
-    resultados = {}
+    regra, tamanho, geracoes = parametros
     
-    for regra in regras:
-        inicio = time.time()
-        
-        automato = AutomatoElementar(regra, tamanho)
-        automato.evoluir(geracoes)
-        
-        fim = time.time()
-        tempo_execucao = fim - inicio
-        
-        stats = automato.obter_estatisticas()
+    # Só a evolução é medida; criação e estatísticas ficam fora do tempo
+    automato = AutomatoElementar(regra, tamanho)
+    
+    inicio = time.perf_counter()
+    automato.evoluir(geracoes)
+    fim = time.perf_counter()
+    
+    return {
+        'tempo_execucao': fim - inicio,
+        'densidade_final': float(np.count_nonzero(automato.estado_atual) / automato.tamanho),
+        'periodo_detectado': automato.detectar_periodo(),
+        'geracoes_executadas': automato.geracao_atual + 1
+    }
+
+
+def _aquecer_motores():
+    """Compila os núcleos sob demanda antes das medições (ex.: Numba)."""
+    _benchmark_regra((0, 8, 1))
+
+
+def benchmark_regras(regras: List[int], tamanho: int = 101, geracoes: int = 100,
+                     paralelo: bool = False) -> Dict:
+    """
+    Faz benchmark de múltiplas regras para comparação de performance.
+    
+    Args:
+        regras: Lista de regras para testar
+        tamanho: Tamanho da grade
+        geracoes: Número de gerações
+        paralelo: Se True, distribui as regras entre processos
         
-        resultados[regra] = {
-            'tempo_execucao': tempo_execucao,
-            'densidade_final': stats['densidade_final'],
-            'periodo_detectado': stats['periodo_detectado'],
-            'geracoes_executadas': stats['geracoes']
-        }
+    Returns:
+        Resultados do benchmark
+    """
+    import time
+    
+    parametros = [(regra, tamanho, geracoes) for regra in regras]
+    
+    inicio = time.perf_counter()
+    
+    if paralelo:
+        # Regras são independentes; processos evitam a disputa pelo GIL
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(initializer=_aquecer_motores) as executor:
+            medicoes = list(executor.map(_benchmark_regra, parametros))
+    else:
+        _aquecer_motores()
+        medicoes = [_benchmark_regra(p) for p in parametros]
+    
+    tempo_decorrido = time.perf_counter() - inicio
+    
+    resultados = dict(zip(regras, medicoes))
     
     return {
         'resultados_individuais': resultados,
         'tempo_total': sum(r['tempo_execucao'] for r in resultados.values()),
+        'tempo_decorrido': tempo_decorrido,
         'regra_mais_rapida': min(resultados.items(), key=lambda x: x[1]['tempo_execucao']),
         'regra_mais_lenta': max(resultados.items(), key=lambda x: x[1]['tempo_execucao'])
     }
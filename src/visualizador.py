@@ -5,18 +5,27 @@ Este módulo fornece ferramentas para visualizar a evolução dos autômatos
 celulares elementares usando matplotlib.
 """
 
+import os
 import numpy as np
+import matplotlib
+
+# Execução sem interface gráfica (HEADLESS=1): backend Agg, sem janelas.
+# Vazio, '0', 'false' e 'no' (sem diferenciar maiúsculas) mantêm a interface.
+# Precisa ser definido antes da importação de pyplot.
+MODO_HEADLESS = os.environ.get('HEADLESS', '').strip().lower() not in ('', '0', 'false', 'no')
+if MODO_HEADLESS:
+    matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.colors import ListedColormap
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import ListedColormap, to_rgba_array
 from typing import Optional, Tuple, List
-import os
 from datetime import datetime
 
 try:
-    from .automato_elementar import AutomatoElementar
+    from .automato_elementar import AutomatoElementar, evoluir_em_lote
 except ImportError:
-    from automato_elementar import AutomatoElementar
+    from automato_elementar import AutomatoElementar, evoluir_em_lote
 
 
 class Visualizador:
@@ -42,6 +51,12 @@ class Visualizador:
             'roxo': ['lavender', 'purple']
         }
         self.esquema_cor_atual = 'classico'
+        
+        # Última matriz de evolução obtida: (buffer do histórico, geração, matriz)
+        self._cache_matriz = (None, -1, None)
+        
+        # Colormaps já criados, por esquema de cores
+        self._colormaps = {}
     
     def definir_esquema_cor(self, esquema: str):
         """
@@ -55,6 +70,81 @@ class Visualizador:
         else:
             raise ValueError(f"Esquema '{esquema}' não disponível. Use: {list(self.cores.keys())}")
     
+    def _colormap(self) -> ListedColormap:
+        """
+        Retorna o colormap do esquema atual, criado no primeiro uso.
+        
+        Returns:
+            Colormap com uma cor por estado
+        """
+        esquema = self.esquema_cor_atual
+        if esquema not in self._colormaps:
+            self._colormaps[esquema] = ListedColormap(self.cores[esquema])
+        return self._colormaps[esquema]
+    
+    def _paleta(self) -> np.ndarray:
+        """
+        Retorna as cores do esquema atual como array RGBA indexado pelo estado.
+        
+        Returns:
+            Array (2, 4) de floats, uma linha por estado
+        """
+        return to_rgba_array(self.cores[self.esquema_cor_atual])
+    
+    def _criar_celulas(self, ax: plt.Axes, estado: np.ndarray) -> PolyCollection:
+        """
+        Desenha as células de um estado como uma única coleção de retângulos.
+        
+        Uma coleção recebe as cores de todas as células em uma chamada
+        (set_facecolors), em vez de uma barra por célula.
+        
+        Args:
+            ax: Eixos onde as células são desenhadas
+            estado: Estado inicial das células
+            
+        Returns:
+            Coleção com um retângulo de altura 1 por célula
+        """
+        vertices = _vertices_retangulos(np.arange(len(estado)) - 0.5)
+        celulas = PolyCollection(vertices, edgecolors='none',
+                                 facecolors=self._paleta()[np.asarray(estado, dtype=np.uint8)])
+        ax.add_collection(celulas)
+        return celulas
+    
+    def _matriz(self) -> np.ndarray:
+        """
+        Retorna a matriz de evolução, reaproveitando a obtida anteriormente.
+        
+        No modo compacto cada obtenção desempacota todo o histórico. As linhas
+        já gravadas no buffer do autômato não mudam (resetar cria um novo
+        buffer), então a matriz só é refeita quando o buffer ou a geração
+        atual mudam.
+        
+        Returns:
+            Matriz de evolução (gerações x células)
+        """
+        buffer, geracao, matriz = self._cache_matriz
+        if buffer is not self.automato._buffer or geracao != self.automato.geracao_atual:
+            matriz = self.automato.obter_matriz_evolucao()
+            self._cache_matriz = (self.automato._buffer, self.automato.geracao_atual, matriz)
+        return matriz
+    
+    def _matriz_rgba(self, matriz: np.ndarray) -> np.ndarray:
+        """
+        Converte uma matriz de evolução em imagem RGBA de 8 bits.
+        
+        Cada estado indexa diretamente a paleta do esquema atual, evitando a
+        normalização e o mapeamento de cores feitos pelo imshow.
+        
+        Args:
+            matriz: Matriz de evolução com estados 0 e 1
+            
+        Returns:
+            Array (gerações, células, 4) do tipo uint8
+        """
+        paleta = (self._paleta() * 255).round().astype(np.uint8)
+        return paleta[np.asarray(matriz, dtype=np.uint8)]
+    
     def mostrar_evolucao(self, figsize: Tuple[int, int] = (12, 8), salvar: bool = False, 
                         nome_arquivo: Optional[str] = None) -> plt.Figure:
         """
@@ -68,7 +158,7 @@ class Visualizador:
         Returns:
             Figura matplotlib
         """
-        matriz = self.automato.obter_matriz_evolucao()
+        matriz = self._matriz()
         
         if matriz.size == 0:
             raise ValueError("Autômato não foi evoluído ainda")
@@ -77,17 +167,18 @@ class Visualizador:
         fig, ax = plt.subplots(figsize=figsize)
         
         # Configurar colormap
-        cmap = ListedColormap(self.cores[self.esquema_cor_atual])
+        cmap = self._colormap()
         
         # Plotar matriz
         im = ax.imshow(matriz, cmap=cmap, interpolation='nearest', aspect='auto')
         
         # Configurar título e labels
-        stats = self.automato.obter_estatisticas()
+        # Apenas o período é necessário: evita recalcular todas as estatísticas
+        periodo = self.automato.detectar_periodo()
         titulo = f"Regra {self.automato.regra} - {len(matriz)} gerações"
         
-        if stats.get('periodo_detectado'):
-            titulo += f" (Período: {stats['periodo_detectado']})"
+        if periodo:
+            titulo += f" (Período: {periodo})"
         
         ax.set_title(titulo, fontsize=14, fontweight='bold')
         ax.set_xlabel('Posição na Grade', fontsize=12)
@@ -129,12 +220,9 @@ class Visualizador:
         """
         fig, ax = plt.subplots(figsize=figsize)
         
-        # Cores para células ativas e inativas
-        cores = [self.cores[self.esquema_cor_atual][estado] for estado in self.automato.estado_atual]
-        
-        # Criar gráfico de barras
+        # Células ativas e inativas coloridas pelo esquema atual
         posicoes = range(len(self.automato.estado_atual))
-        ax.bar(posicoes, [1] * len(posicoes), color=cores, width=1.0, edgecolor='none')
+        self._criar_celulas(ax, self.automato.estado_atual)
         
         ax.set_title(f"Estado Atual - Regra {self.automato.regra} (Geração {self.automato.geracao_atual})")
         ax.set_xlabel('Posição')
@@ -149,7 +237,7 @@ class Visualizador:
         return fig
     
     def criar_animacao(self, intervalo: int = 100, salvar: bool = False, 
-                      nome_arquivo: Optional[str] = None) -> animation.FuncAnimation:
+                      nome_arquivo: Optional[str] = None) -> 'matplotlib.animation.FuncAnimation':
         """
         Cria uma animação da evolução do autômato.
         
@@ -161,14 +249,23 @@ class Visualizador:
         Returns:
             Objeto de animação matplotlib
         """
-        if not self.automato.historico:
+        # Importado só aqui: as demais visualizações não usam animação
+        import matplotlib.animation as animation
+        
+        # Obtido uma vez: no modo compacto cada acesso desempacota o histórico
+        historico = self._matriz()
+        
+        if len(historico) == 0:
             raise ValueError("Autômato não foi evoluído ainda")
         
         fig, ax = plt.subplots(figsize=(15, 3))
         
-        # Configuração inicial
-        posicoes = range(self.automato.tamanho)
-        barras = ax.bar(posicoes, [1] * self.automato.tamanho, width=1.0, edgecolor='none')
+        # Uma imagem RGBA de uma linha: cada frame só troca os dados da
+        # imagem, já em cores, sem normalização nem colormap no desenho
+        paleta = (self._paleta() * 255).round().astype(np.uint8)
+        imagem = ax.imshow(paleta[historico[0]][np.newaxis], aspect='auto',
+                           interpolation='nearest',
+                           extent=(-0.5, self.automato.tamanho - 0.5, 0, 1))
         
         ax.set_title(f"Evolução - Regra {self.automato.regra}")
         ax.set_xlabel('Posição')
@@ -183,18 +280,14 @@ class Visualizador:
         
         def atualizar_frame(frame):
             """Atualiza um frame da animação."""
-            estado = self.automato.historico[frame]
-            cores = [self.cores[self.esquema_cor_atual][cell] for cell in estado]
-            
-            for barra, cor in zip(barras, cores):
-                barra.set_color(cor)
+            imagem.set_data(paleta[historico[frame]][np.newaxis])
             
             texto_geracao.set_text(f'Geração: {frame}')
-            return barras + [texto_geracao]
+            return [imagem, texto_geracao]
         
         # Criar animação
         anim = animation.FuncAnimation(
-            fig, atualizar_frame, frames=len(self.automato.historico),
+            fig, atualizar_frame, frames=len(historico),
             interval=intervalo, blit=True, repeat=True
         )
         
@@ -230,16 +323,12 @@ class Visualizador:
         if n_regras == 1:
             axes = [axes]
         
-        cmap = ListedColormap(self.cores[self.esquema_cor_atual])
+        # Todas as regras evoluídas juntas, a partir da célula central ativa
+        historicos = evoluir_em_lote(regras, self.automato.tamanho, geracoes)
         
-        for i, regra in enumerate(regras):
-            # Criar novo autômato para cada regra
-            automato_temp = AutomatoElementar(regra, self.automato.tamanho)
-            automato_temp.evoluir(geracoes)
-            matriz = automato_temp.obter_matriz_evolucao()
-            
+        for i, (regra, matriz) in enumerate(zip(regras, historicos)):
             # Plotar
-            im = axes[i].imshow(matriz, cmap=cmap, interpolation='nearest', aspect='auto')
+            axes[i].imshow(self._matriz_rgba(matriz), interpolation='nearest', aspect='auto')
             axes[i].set_title(f'Regra {regra}', fontweight='bold')
             axes[i].set_xlabel('Posição')
             
@@ -264,11 +353,11 @@ class Visualizador:
         Returns:
             Figura matplotlib
         """
-        if not self.automato.historico:
+        # Calcular densidades (uma redução sobre o histórico inteiro)
+        densidades = self.automato.obter_densidades()
+        if len(densidades) == 0:
             raise ValueError("Autômato não foi evoluído ainda")
         
-        # Calcular densidades
-        densidades = [np.mean(estado) for estado in self.automato.historico]
         geracoes = range(len(densidades))
         
         fig, ax = plt.subplots(figsize=figsize)
@@ -307,11 +396,12 @@ class Visualizador:
             (0, 1, 1), (0, 1, 0), (0, 0, 1), (0, 0, 0)
         ]
         
-        # Plotar configurações de entrada
-        for i, config in enumerate(configuracoes):
-            for j, valor in enumerate(config):
-                cor = self.cores[self.esquema_cor_atual][valor]
-                ax1.add_patch(plt.Rectangle((i*3 + j, 0), 1, 1, facecolor=cor, edgecolor='black'))
+        paleta = self._paleta()
+        
+        # Plotar configurações de entrada (as 24 células em uma coleção)
+        entradas = np.array(configuracoes).ravel()
+        ax1.add_collection(PolyCollection(_vertices_retangulos(np.arange(24)),
+                                          facecolors=paleta[entradas], edgecolors='black'))
         
         ax1.set_xlim(0, 24)
         ax1.set_ylim(0, 1)
@@ -322,9 +412,9 @@ class Visualizador:
         
         # Plotar saídas correspondentes
         regra_binaria = format(self.automato.regra, '08b')
-        for i, bit in enumerate(regra_binaria):
-            cor = self.cores[self.esquema_cor_atual][int(bit)]
-            ax2.add_patch(plt.Rectangle((i*3 + 1, 0), 1, 1, facecolor=cor, edgecolor='black'))
+        saidas = np.array([int(bit) for bit in regra_binaria])
+        ax2.add_collection(PolyCollection(_vertices_retangulos(np.arange(8) * 3 + 1),
+                                          facecolors=paleta[saidas], edgecolors='black'))
         
         ax2.set_xlim(0, 24)
         ax2.set_ylim(0, 1)
@@ -335,3 +425,44 @@ class Visualizador:
         
         plt.tight_layout()
         return fig
+
+
+def _vertices_retangulos(esquerdas: np.ndarray) -> np.ndarray:
+    """
+    Monta os vértices de retângulos de largura e altura 1 apoiados em y=0.
+    
+    Args:
+        esquerdas: Coordenada x da borda esquerda de cada retângulo
+        
+    Returns:
+        Array (retângulos, 4, 2) de vértices para uma PolyCollection
+    """
+    vertices = np.empty((len(esquerdas), 4, 2))
+    vertices[:, :, 0] = np.asarray(esquerdas)[:, np.newaxis] + np.array([0, 0, 1, 1])
+    vertices[:, :, 1] = np.array([0, 1, 1, 0])
+    return vertices
+
+
+def exibir_figuras(nome: str, diretorio: str = 'imagens'):
+    """
+    Exibe as figuras abertas ou, em modo HEADLESS, salva e as fecha.
+    
+    Em modo HEADLESS nada bloqueia esperando pela interface gráfica e a
+    memória das figuras é liberada logo após salvá-las em PNG.
+    
+    Args:
+        nome: Nome base dos arquivos salvos em modo HEADLESS
+        diretorio: Diretório onde as imagens são salvas
+    """
+    if not MODO_HEADLESS:
+        plt.show()
+        return
+    
+    numeros = plt.get_fignums()
+    os.makedirs(diretorio, exist_ok=True)
+    
+    for i, numero in enumerate(numeros):
+        sufixo = f"_{i + 1}" if len(numeros) > 1 else ""
+        figura = plt.figure(numero)
+        figura.savefig(os.path.join(diretorio, f"{nome}{sufixo}.png"))
+        plt.close(figura)
@@ -13,8 +13,15 @@ import os
 # Adicionar src ao path para imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from automato_elementar import AutomatoElementar
+from automato_elementar import (AutomatoElementar, evoluir_em_lote, evoluir_em_lote_com_contagens,
+                                detectar_periodo_matriz)
 from utils import *
+from _kernels import NUMBA_DISPONIVEL
+from cache import automato_evoluido
+from classificador import ClassificadorWolfram
+
+# Motores testados contra a implementação de referência
+MOTORES_TESTE = ['tabela', 'bits'] + (['numba'] if NUMBA_DISPONIVEL else [])
 
 
 class TestAutomatoElementar(unittest.TestCase):
@@ -48,6 +55,11 @@ class TestAutomatoElementar(unittest.TestCase):
         
         with self.assertRaises(ValueError):
             AutomatoElementar(256, 10)
+        
+        # Floats só são aceitos com valor inteiro
+        self.assertEqual(type(AutomatoElementar(30.0, 10).regra), int)
+        with self.assertRaises(ValueError):
+            AutomatoElementar(30.5, 10)
     
     def test_tabela_regra_30(self):
         """Testa criação da tabela de regra para regra 30."""
@@ -117,6 +129,55 @@ class TestAutomatoElementar(unittest.TestCase):
         # Para regras homogêneas, período deve ser 1 (estado fixo)
         self.assertEqual(periodo, 1)
     
+    def test_deteccao_periodo_incremental(self):
+        """Testa a detecção de período ao evoluir em várias chamadas."""
+        automato = AutomatoElementar(50, 9)
+        automato.evoluir(1)
+        self.assertIsNone(automato.detectar_periodo())
+        
+        automato.evoluir(3)
+        automato.evoluir(6)
+        self.assertEqual(automato.detectar_periodo(), 2)
+        self.assertIsNone(automato.detectar_periodo(janela_busca=1))
+        self.assertEqual(detectar_periodo_matriz(automato.historico), 2)
+        
+        # Resetar descarta o período encontrado
+        automato.resetar()
+        self.assertIsNone(automato.detectar_periodo())
+    
+    def test_deteccao_periodo_estado_alterado(self):
+        """Testa que alterar estado_atual reinicia a detecção de período."""
+        for compacto in [False, True]:
+            # Estados da trajetória anterior não produzem um período falso
+            automato = AutomatoElementar(170, 8, historico_compacto=compacto)
+            automato.evoluir(3)
+            automato.estado_atual = automato.historico[0]
+            automato.evoluir(60)
+            self.assertEqual(automato.detectar_periodo(), 8)
+            
+            # Um período encontrado antes da alteração é descartado
+            automato = AutomatoElementar(170, 8, historico_compacto=compacto)
+            automato.evoluir(20)
+            self.assertEqual(automato.detectar_periodo(), 8)
+            automato.estado_atual = np.zeros(8, dtype=np.uint8)
+            automato.evoluir(50)
+            self.assertEqual(automato.detectar_periodo(), 1)
+            self.assertEqual(automato.obter_estatisticas()['periodo_detectado'], 1)
+    
+    def test_repeticao_ciclo(self):
+        """Testa que gerações após um ciclo detectado equivalem às calculadas."""
+        for compacto in [False, True]:
+            automato = AutomatoElementar(50, 9, historico_compacto=compacto)
+            automato.evoluir(100)
+            self.assertEqual(automato.detectar_periodo(), 2)
+            
+            referencia = AutomatoElementar(50, 9)
+            for geracao in range(1, 101):
+                referencia.estado_atual = referencia.proximo_passo()
+                np.testing.assert_array_equal(automato.historico[geracao],
+                                              referencia.estado_atual)
+            np.testing.assert_array_equal(automato.estado_atual, referencia.estado_atual)
+    
     def test_estatisticas(self):
         """Testa cálculo de estatísticas."""
         automato = AutomatoElementar(30, 5)
@@ -133,6 +194,140 @@ class TestAutomatoElementar(unittest.TestCase):
         self.assertEqual(stats['regra'], 30)
         self.assertEqual(stats['tamanho'], 5)
         self.assertEqual(stats['geracoes'], 6)  # Estado inicial + 5 gerações
+    
+    def test_evolucao_equivale_passo_a_passo(self):
+        """Testa proximo_passo e evoluir contra o cálculo célula a célula."""
+        # Tamanhos menores, iguais e maiores que uma palavra de 64 bits
+        for tamanho in [5, 64, 101, 128]:
+            for contorno in ['circular', 'fixo']:
+                for regra in [30, 90, 110, 184]:
+                    estado_inicial = gerar_estado_aleatorio(tamanho, 0.5, semente=regra)
+        
+                    referencia = AutomatoElementar(regra, tamanho, contorno)
+                    referencia.resetar(estado_inicial)
+                    for _ in range(10):
+                        # Definição célula a célula pela tabela da regra
+                        esperado = np.array([
+                            referencia.tabela_regra[referencia._obter_vizinhanca(i)]
+                            for i in range(tamanho)
+                        ])
+                        np.testing.assert_array_equal(referencia.proximo_passo(), esperado)
+                        referencia.estado_atual = esperado
+        
+                    for motor in MOTORES_TESTE:
+                        automato = AutomatoElementar(regra, tamanho, contorno, motor)
+                        automato.resetar(estado_inicial)
+                        automato.evoluir(10)
+        
+                        np.testing.assert_array_equal(automato.estado_atual,
+                                                      referencia.estado_atual)
+    
+    def test_historico_em_buffer(self):
+        """Testa o histórico ao evoluir em várias chamadas."""
+        completo = AutomatoElementar(110, 33)
+        completo.evoluir(40)
+        
+        automato = AutomatoElementar(110, 33)
+        anterior = automato.evoluir(3)
+        for geracoes in [1, 0, 7, 29]:
+            automato.evoluir(geracoes)
+        
+        np.testing.assert_array_equal(automato.obter_matriz_evolucao(),
+                                      completo.obter_matriz_evolucao())
+        self.assertEqual(len(anterior), 4)
+        np.testing.assert_array_equal(anterior, completo.historico[:4])
+        
+        # Com reserva prévia, evoluir passo a passo não realoca o buffer
+        automato.resetar(geracoes_previstas=5)
+        buffer = automato._buffer
+        for _ in range(5):
+            automato.evoluir(1)
+        self.assertIs(automato._buffer, buffer)
+        np.testing.assert_array_equal(automato.historico, completo.historico[:6])
+        
+        # O histórico é somente leitura
+        with self.assertRaises(ValueError):
+            automato.historico[0, 0] = 1
+        
+        # Alterar estado_atual não modifica o histórico já registrado
+        ultimo = automato.historico[-1].copy()
+        automato.estado_atual = np.zeros(33, dtype=int)
+        automato.evoluir(1)
+        np.testing.assert_array_equal(automato.historico[-2], ultimo)
+        np.testing.assert_array_equal(automato.historico[-1], np.zeros(33))
+        
+        # Alterações no próprio array de estado_atual também são detectadas
+        ultimo = automato.historico[-1].copy()
+        automato.estado_atual[0] = 1
+        automato.evoluir(1)
+        np.testing.assert_array_equal(automato.historico[-2], ultimo)
+        self.assertEqual(automato.estado_atual.dtype, np.uint8)
+    
+    def test_historico_compacto(self):
+        """Testa o histórico com um bit por célula contra o histórico comum."""
+        for tamanho in [5, 70]:
+            for contorno in ['circular', 'fixo']:
+                comum = AutomatoElementar(90, tamanho, contorno)
+                compacto = AutomatoElementar(90, tamanho, contorno, historico_compacto=True)
+                for geracoes in [3, 300]:
+                    comum.evoluir(geracoes)
+                    compacto.evoluir(geracoes)
+                
+                np.testing.assert_array_equal(compacto.obter_matriz_evolucao(),
+                                              comum.obter_matriz_evolucao())
+                np.testing.assert_array_equal(compacto.estado_atual, comum.estado_atual)
+                np.testing.assert_allclose(compacto.obter_densidades(),
+                                           comum.obter_densidades())
+                self.assertEqual(compacto.detectar_periodo(), comum.detectar_periodo())
+    
+    def test_evoluir_em_lote(self):
+        """Testa evolução simultânea de várias regras."""
+        regras = [0, 30, 90, 110, 255]
+        for contorno in ['circular', 'fixo']:
+            historicos = evoluir_em_lote(regras, 21, 15, condicao_contorno=contorno)
+            self.assertEqual(historicos.shape, (len(regras), 16, 21))
+            
+            for regra, matriz in zip(regras, historicos):
+                automato = AutomatoElementar(regra, 21, contorno)
+                automato.evoluir(15)
+                np.testing.assert_array_equal(matriz, automato.obter_matriz_evolucao())
+            
+            # Contagens feitas durante a evolução
+            mesmos, vivas, mudancas = evoluir_em_lote_com_contagens(
+                regras, 21, 15, condicao_contorno=contorno)
+            np.testing.assert_array_equal(mesmos, historicos)
+            np.testing.assert_array_equal(vivas, historicos.sum(axis=2))
+            np.testing.assert_array_equal(
+                mudancas, (historicos[:, 1:] != historicos[:, :-1]).sum(axis=2))
+        
+        with self.assertRaises(ValueError):
+            evoluir_em_lote([30, 256], 21, 15)
+    
+    def test_validacao_motor(self):
+        """Testa validação do motor de evolução."""
+        if NUMBA_DISPONIVEL:
+            self.assertEqual(AutomatoElementar(30, 10).motor, 'numba')
+        else:
+            self.assertEqual(AutomatoElementar(30, 10).motor, 'tabela')
+            self.assertEqual(AutomatoElementar(30, 2048).motor, 'bits')
+        
+        with self.assertRaises(ValueError):
+            AutomatoElementar(30, 10, motor='inexistente')
+    
+    def test_evolucao_paralela(self):
+        """Testa o núcleo paralelo (por trechos do estado) contra o sequencial."""
+        if not NUMBA_DISPONIVEL:
+            return
+        
+        import _kernels
+        for tamanho in [1, 2, 3, 70, 1001]:
+            for circular in [True, False]:
+                esperado = np.zeros((20, tamanho), dtype=np.uint8)
+                esperado[0] = gerar_estado_aleatorio(tamanho, 0.5, semente=tamanho)
+                paralelo = esperado.copy()
+                _kernels.evoluir_regra(esperado, 110, circular)
+                _kernels.evoluir_regra_paralelo(paralelo, 110, circular)
+                np.testing.assert_array_equal(paralelo, esperado)
 
 
 class TestUtils(unittest.TestCase):
@@ -152,6 +347,13 @@ class TestUtils(unittest.TestCase):
         # Densidade aproximada (com tolerância para aleatoriedade)
         densidade_real = np.mean(estado1)
         self.assertAlmostEqual(densidade_real, densidade, delta=0.1)
+        
+        # Densidades extremas e inválidas
+        self.assertEqual(gerar_estado_aleatorio(tamanho, 0.0).sum(), 0)
+        self.assertEqual(gerar_estado_aleatorio(tamanho, 1.0).sum(), tamanho)
+        for invalida in [-0.5, 1.5, float('nan')]:
+            with self.assertRaises(ValueError):
+                gerar_estado_aleatorio(tamanho, invalida)
     
     def test_gerar_estado_impulso(self):
         """Testa geração de estado impulso."""
@@ -215,6 +417,17 @@ class TestUtils(unittest.TestCase):
         estado_homogeneo = np.array([1, 1, 1, 1, 1])
         simetrias = detectar_simetria(estado_homogeneo)
         self.assertTrue(simetrias['translacional'])
+        self.assertEqual(simetrias['periodo_translacional'], 1)
+        
+        # Padrão que se repete a cada 3 células
+        simetrias = detectar_simetria(np.array([1, 0, 0] * 4))
+        self.assertFalse(simetrias['translacional'])
+        self.assertEqual(simetrias['periodo_translacional'], 3)
+        
+        # Simetria rotacional: binários e não binários (complemento 1 - x)
+        self.assertTrue(detectar_simetria(np.array([1, 1, 0, 0]))['rotacional_180'])
+        self.assertFalse(detectar_simetria(np.array([0, 2]))['rotacional_180'])
+        self.assertTrue(detectar_simetria(np.array([3, -2]))['rotacional_180'])
     
     def test_distancia_hamming(self):
         """Testa cálculo da distância de Hamming."""
@@ -228,6 +441,14 @@ class TestUtils(unittest.TestCase):
         distancia = calcular_distancia_hamming(estado1, estado1)
         self.assertEqual(distancia, 0)
         
+        # Estados empacotados: contagem de bits do XOR
+        empacotado1 = np.packbits(gerar_estado_aleatorio(70, 0.5, semente=1))
+        empacotado2 = np.packbits(gerar_estado_aleatorio(70, 0.5, semente=2))
+        self.assertEqual(
+            calcular_distancia_hamming(empacotado1, empacotado2, empacotados=True),
+            calcular_distancia_hamming(gerar_estado_aleatorio(70, 0.5, semente=1),
+                                       gerar_estado_aleatorio(70, 0.5, semente=2)))
+        
         # Tamanhos diferentes devem gerar erro
         estado3 = np.array([1, 0, 1])
         with self.assertRaises(ValueError):
@@ -263,6 +484,43 @@ class TestUtils(unittest.TestCase):
         # Deve detectar os padrões [1,0], [0,1], etc.
         self.assertIn((1, 0), padroes['padroes'])
         self.assertIn((0, 1), padroes['padroes'])
+        
+        # Valores não binários mantêm as janelas distintas
+        padroes = encontrar_padroes_locais(np.array([[0, 2, 1, 2, 0], [2, 2, 2, 1, 0]]))
+        self.assertEqual(padroes['total_padroes'], 6)
+        self.assertIn((0, 2, 1), padroes['padroes'])
+    
+    def test_analisar_convergencia(self):
+        """Testa a detecção de estado fixo e de ciclo nas últimas gerações."""
+        automato = AutomatoElementar(8, 21)
+        automato.evoluir(30)
+        convergencia = analisar_convergencia(automato)
+        self.assertTrue(convergencia['convergiu'])
+        self.assertEqual(convergencia['tipo_convergencia'], 'estado_fixo')
+        
+        # Regra 1 oscila com período 2: não converge, mas o ciclo é informado
+        automato = AutomatoElementar(1, 21)
+        automato.evoluir(30)
+        convergencia = analisar_convergencia(automato)
+        self.assertFalse(convergencia['convergiu'])
+        self.assertEqual(convergencia['tipo_convergencia'], 'ciclo')
+        self.assertEqual(convergencia['periodo'], 2)
+
+
+class TestCache(unittest.TestCase):
+    """Testes para o cache de autômatos evoluídos."""
+    
+    def test_cache_automato_evoluido(self):
+        """Testa reaproveitamento de autômatos evoluídos."""
+        automato = automato_evoluido(30, 21, 10)
+        self.assertIs(automato, automato_evoluido(30, 21, 10))
+        self.assertEqual(automato.geracao_atual, 10)
+        
+        # Estado inicial diferente gera outra simulação
+        estado = gerar_estado_bloco(21, 5)
+        outro = automato_evoluido(30, 21, 10, estado)
+        self.assertIsNot(automato, outro)
+        np.testing.assert_array_equal(outro.historico[0], estado)
 
 
 class TestRegrasConchecidas(unittest.TestCase):
@@ -299,6 +557,46 @@ class TestRegrasConchecidas(unittest.TestCase):
         # (pode não ser sempre verdade dependendo do número de gerações)
 
 
+class TestClassificador(unittest.TestCase):
+    """Testes para o classificador de Wolfram."""
+    
+    def test_cache_classificacao(self):
+        """Testa reaproveitamento de classificações por análise."""
+        classificador = ClassificadorWolfram()
+        resultado = classificador.classificar_regra(30, 31, 50, usar_cache=False)
+        self.assertIs(resultado, classificador.cache_classificacao[(30, 31, 50)])
+        
+        # O lote reaproveita a análise já feita e guarda as novas
+        lote = classificador.classificar_em_lote([30, 110], 31, 50)
+        self.assertIs(lote[30], resultado)
+        self.assertIn((110, 31, 50), classificador.cache_classificacao)
+    
+    def test_classificacao_evolucao_curta(self):
+        """Testa que ciclos em evoluções curtas já classificam a regra como classe 2."""
+        classificador = ClassificadorWolfram()
+        
+        # A periodicidade é detectada mesmo com menos de 2 * 50 gerações;
+        # sem o cache, as regras da literatura também passam pela análise
+        for regra in [50, 77, 178, 179, 222, 254]:
+            resultado = classificador.classificar_regra(regra, 51, 30, usar_cache=False)
+            self.assertEqual(resultado['classe'], 2)
+        for regra in [238, 250, 252]:
+            resultado = classificador.classificar_regra(regra, 31, 60, usar_cache=False)
+            self.assertEqual(resultado['classe'], 2)
+    
+    def test_classificar_multiplas_regras_argumentos(self):
+        """Testa normalização das regras e rejeição de argumentos desconhecidos."""
+        classificador = ClassificadorWolfram()
+        
+        resultados = classificador.classificar_multiplas_regras([30.0, 30, 30.5])
+        self.assertEqual(resultados[30]['classe'], 3)
+        self.assertIsNone(resultados[30.5]['classe'])
+        self.assertIn('inteiro', resultados[30.5]['erro'])
+        
+        with self.assertRaises(TypeError):
+            classificador.classificar_multiplas_regras([30], foo=1)
+
+
 def executar_testes_completos():
     """Executa todos os testes e mostra relatório."""
     print("🧪 EXECUTANDO TESTES DOS AUTÔMATOS CELULARES")